@@ -0,0 +1,192 @@
+import math
+from bisect import bisect_right
+
+# Data drift between training data and live requests.
+#
+# train.py builds a reference sketch: quantile bin edges + counts for the
+# numeric features, frequency tables for the categoricals. Live requests are
+# counted into the same bins, so a live sketch is a fixed number of counters
+# per feature and sketches from different Lambda containers merge by adding.
+
+NUMERIC_FEATURES = ["Study_Hours_per_Week", "Attendance_Rate", "Midterm_Exam_Scores"]
+CATEGORICAL_FEATURES = [
+    "Gender", "Parental_Education_Level",
+    "Internet_Access_at_Home", "Extracurricular_Activities"
+]
+
+REFERENCE_BINS = 10        # deciles, the usual PSI binning
+OTHER = "__other__"        # categories not seen in training
+
+PSI_THRESHOLD = 0.2        # conventional "significant shift"
+KS_P_VALUE = 0.01
+MIN_LIVE_SAMPLES = 200     # below this, sampling noise alone pushes PSI past the threshold
+PSI_EPSILON = 1e-4
+
+
+# ----------------------
+# Reference sketch (built at training time)
+# ----------------------
+def quantile_edges(values, bins=REFERENCE_BINS):
+    values = sorted(values)
+    if not values:
+        raise ValueError("Cannot build a reference sketch from no values")
+    edges = []
+    for i in range(1, bins):
+        edge = float(values[min(len(values) - 1, (i * len(values)) // bins)])
+        if not edges or edge > edges[-1]:
+            edges.append(edge)
+    return edges
+
+
+def build_reference(columns, bins=REFERENCE_BINS):
+    """Reference sketch from training data, given as {feature: values}."""
+    reference = {}
+    for feature in NUMERIC_FEATURES:
+        values = [float(v) for v in columns[feature]]
+        edges = quantile_edges(values, bins)
+        counts = [0] * (len(edges) + 1)
+        for v in values:
+            counts[bisect_right(edges, v)] += 1
+        reference[feature] = {"type": "numeric", "edges": edges, "counts": counts}
+    for feature in CATEGORICAL_FEATURES:
+        counts = {}
+        for v in columns[feature]:
+            counts[str(v)] = counts.get(str(v), 0) + 1
+        reference[feature] = {"type": "categorical", "counts": counts}
+    return reference
+
+
+# ----------------------
+# Live sketch
+# ----------------------
+class DriftSketch:
+    """Counts of live feature values in the reference's bins/categories."""
+
+    def __init__(self, reference):
+        self.reference = reference
+        self.counts = {}
+        for feature, ref in reference.items():
+            if ref["type"] == "numeric":
+                self.counts[feature] = [0] * len(ref["counts"])
+            else:
+                self.counts[feature] = dict.fromkeys(list(ref["counts"]) + [OTHER], 0)
+
+    def bin_of(self, feature, value):
+        ref = self.reference[feature]
+        if ref["type"] == "numeric":
+            return bisect_right(ref["edges"], float(value))
+        value = str(value)
+        return value if value in ref["counts"] else OTHER
+
+    def update(self, record):
+        for feature in self.counts:
+            value = record.get(feature)
+            if value is None:
+                continue
+            self.counts[feature][self.bin_of(feature, value)] += 1
+
+    def merge(self, other):
+        for feature, counts in other.counts.items():
+            for key in (range(len(counts)) if isinstance(counts, list) else counts):
+                self.counts[feature][key] += counts[key]
+        return self
+
+    def total(self, feature):
+        counts = self.counts[feature]
+        return sum(counts if isinstance(counts, list) else counts.values())
+
+    def is_empty(self):
+        return all(self.total(feature) == 0 for feature in self.counts)
+
+    # Flat {"<feature>#<bin>": count} form, one counter per DynamoDB attribute
+    def to_flat(self):
+        flat = {}
+        for feature, counts in self.counts.items():
+            items = enumerate(counts) if isinstance(counts, list) else counts.items()
+            for key, n in items:
+                if n:
+                    flat[f"{feature}#{key}"] = n
+        return flat
+
+    @classmethod
+    def from_flat(cls, reference, flat):
+        sketch = cls(reference)
+        for name, n in flat.items():
+            feature, _, key = name.partition("#")
+            if feature not in sketch.counts:
+                continue
+            if isinstance(sketch.counts[feature], list):
+                key = int(key)
+                if key >= len(sketch.counts[feature]):
+                    continue
+            elif key not in sketch.counts[feature]:
+                continue
+            sketch.counts[feature][key] += int(n)
+        return sketch
+
+
+# ----------------------
+# Statistics
+# ----------------------
+def proportions(counts):
+    total = sum(counts)
+    return [c / total if total else 0.0 for c in counts]
+
+
+def psi(expected, actual):
+    """Population stability index between two count vectors over the same bins."""
+    score = 0.0
+    for e, a in zip(proportions(expected), proportions(actual)):
+        e, a = max(e, PSI_EPSILON), max(a, PSI_EPSILON)
+        score += (a - e) * math.log(a / e)
+    return score
+
+
+def ks(expected, actual):
+    """Two-sample KS statistic and asymptotic p-value on binned counts.
+
+    Binning can only hide differences, so the statistic is a lower bound on
+    the exact one.
+    """
+    n, m = sum(expected), sum(actual)
+    if not n or not m:
+        return 0.0, 1.0
+    d, cdf_e, cdf_a = 0.0, 0.0, 0.0
+    for e, a in zip(expected, actual):
+        cdf_e += e / n
+        cdf_a += a / m
+        d = max(d, abs(cdf_e - cdf_a))
+
+    effective = math.sqrt(n * m / (n + m))
+    lam = (effective + 0.12 + 0.11 / effective) * d
+    if lam < 1e-3:
+        return d, 1.0
+    p_value = 2 * sum((-1) ** (k - 1) * math.exp(-2 * k * k * lam * lam) for k in range(1, 101))
+    return d, min(max(p_value, 0.0), 1.0)
+
+
+def drift_report(reference, sketch):
+    features = {}
+    drifted = []
+    for feature, ref in reference.items():
+        live = sketch.counts[feature]
+        if ref["type"] == "numeric":
+            expected, actual = ref["counts"], live
+        else:
+            keys = list(ref["counts"]) + [OTHER]
+            expected = [ref["counts"].get(k, 0) for k in keys]
+            actual = [live[k] for k in keys]
+
+        count = sum(actual)
+        stats = {"count": count, "psi": psi(expected, actual)}
+        significant = stats["psi"] >= PSI_THRESHOLD
+        if ref["type"] == "numeric":
+            stats["ks"], stats["p_value"] = ks(expected, actual)
+            significant = significant or stats["p_value"] < KS_P_VALUE
+
+        stats["drift"] = significant and count >= MIN_LIVE_SAMPLES
+        if stats["drift"]:
+            drifted.append(feature)
+        features[feature] = stats
+
+    return {"features": features, "drifted": drifted, "retrain": bool(drifted)}
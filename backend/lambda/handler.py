@@ -1,7 +1,13 @@
 import json
+import os
+import time
+import urllib.request
 import boto3
 from decimal import Decimal
 
+import drift
+import stream_handler
+
 # ----------------------
 # AWS Clients
 # ----------------------
@@ -11,6 +17,26 @@ table = dynamodb.Table("StudentPerformancePredictions")
 runtime = boto3.client("sagemaker-runtime", region_name="ap-southeast-1")
 sagemaker_endpoint = "student-performance-model-endpoint"  
 
+# Optional: point at a local inference server (ml_model/serve.py) instead of SageMaker
+inference_url = os.environ.get("INFERENCE_URL")
+inference_timeout = float(os.environ.get("INFERENCE_TIMEOUT", "5"))   # seconds
+
+MAX_SIMULATION_POINTS = 10000
+SIMULATION_FEATURES = drift.NUMERIC_FEATURES + drift.CATEGORICAL_FEATURES
+
+# Optional: drift tracking against the reference sketch written by train.py (s3://bucket/key)
+aggregates_table = dynamodb.Table("StudentPerformanceAggregates")
+s3 = boto3.client("s3", region_name="ap-southeast-1")
+drift_reference_uri = os.environ.get("DRIFT_REFERENCE_URI")
+
+DRIFT_LIVE_ID = "drift#live"
+DRIFT_RETRAIN_ID = "drift#retrain"
+DRIFT_FLUSH_EVERY = int(os.environ.get("DRIFT_FLUSH_EVERY", "10"))
+DRIFT_FLUSH_SECONDS = 60
+
+# Per-container drift counts, flushed to DynamoDB and merged there
+drift_state = {"reference": None, "sketch": None, "pending": 0, "last_flush": time.time()}
+
 # Helper: Convert floats to Decimal for DynamoDB
 def convert_to_decimal(item):
     for k, v in item.items():
@@ -18,13 +44,143 @@ def convert_to_decimal(item):
             item[k] = Decimal(str(v))
     return item
 
+# Helper: Send records to the model and return the decoded response
+def invoke_model(records, explain=False):
+    if explain:
+        payload = json.dumps({"instances": records, "explain": True})
+    else:
+        payload = json.dumps(records)  # list of dicts
+    if inference_url:
+        request = urllib.request.Request(
+            f"{inference_url.rstrip('/')}/invocations",
+            data=payload.encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=inference_timeout) as response:
+            result = json.loads(response.read().decode("utf-8"))
+    else:
+        sm_response = runtime.invoke_endpoint(
+            EndpointName=sagemaker_endpoint,
+            ContentType="application/json",
+            Body=payload
+        )
+        result = json.loads(sm_response["Body"].read().decode("utf-8"))
+
+    # A model failure must not be stored or returned as a result
+    if "error" in result:
+        raise ValueError(f"Model error: {result['error']}")
+    return result
+
+# Helper: Load the training reference sketch once per container
+def load_drift_reference():
+    if drift_state["reference"] is None:
+        bucket, _, key = drift_reference_uri[len("s3://"):].partition("/")
+        body = s3.get_object(Bucket=bucket, Key=key)["Body"].read()
+        drift_state["reference"] = json.loads(body.decode("utf-8"))
+        drift_state["sketch"] = drift.DriftSketch(drift_state["reference"])
+    return drift_state["reference"]
+
+# Helper: Add this container's counts to the shared live sketch
+def flush_drift():
+    sketch = drift_state["sketch"]
+    if sketch is not None and not sketch.is_empty():
+        flat = sketch.to_flat()
+        aggregates_table.update_item(
+            Key={"AggregateID": DRIFT_LIVE_ID},
+            UpdateExpression="ADD " + ", ".join(f"#c{i} :c{i}" for i in range(len(flat))),
+            ExpressionAttributeNames={f"#c{i}": name for i, name in enumerate(flat)},
+            ExpressionAttributeValues={f":c{i}": n for i, n in enumerate(flat.values())}
+        )
+        drift_state["sketch"] = drift.DriftSketch(drift_state["reference"])
+    drift_state["pending"] = 0
+    drift_state["last_flush"] = time.time()
+
+# Helper: Count a scored record for drift; never fails the request
+def record_drift(record):
+    if not drift_reference_uri:
+        return
+    try:
+        load_drift_reference()
+        drift_state["sketch"].update(record)
+        drift_state["pending"] += 1
+        if (drift_state["pending"] >= DRIFT_FLUSH_EVERY
+                or time.time() - drift_state["last_flush"] >= DRIFT_FLUSH_SECONDS):
+            flush_drift()
+    except Exception as e:
+        print(f"Drift tracking skipped: {e}")
+
+def is_number(value):
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+
+# Helper: Values for one simulated feature, {"values": [...]} or {"min", "max", "steps"}
+def build_axis(feature, spec):
+    # The model ignores unknown columns, so a misspelled feature would give a flat curve
+    if feature not in SIMULATION_FEATURES:
+        raise ValueError(f"Cannot simulate {feature}, expected one of {', '.join(SIMULATION_FEATURES)}")
+    if not isinstance(spec, dict):
+        raise ValueError(f"Range for {feature} must be an object")
+    numeric = feature in drift.NUMERIC_FEATURES
+
+    if "values" in spec:
+        if not isinstance(spec["values"], list):
+            raise ValueError(f"values for {feature} must be a list")
+        values = list(spec["values"])
+        if numeric and not all(is_number(v) for v in values):
+            raise ValueError(f"values for {feature} must be numbers")
+    else:
+        if not numeric:
+            raise ValueError(f"{feature} is categorical, give its values")
+        if not all(is_number(spec.get(k)) for k in ("min", "max", "steps")):
+            raise ValueError(f"min, max and steps for {feature} must be numbers")
+        start, stop, steps = float(spec["min"]), float(spec["max"]), int(spec["steps"])
+        if steps < 1:
+            raise ValueError(f"steps must be at least 1 for {feature}")
+        # Reject before building the list: a huge steps would exhaust memory first
+        if steps > MAX_SIMULATION_POINTS:
+            raise ValueError(f"{feature} has {steps} steps, maximum is {MAX_SIMULATION_POINTS}")
+        if steps == 1:
+            values = [start]
+        else:
+            step = (stop - start) / (steps - 1)
+            values = [start + i * step for i in range(steps)]
+    if not values:
+        raise ValueError(f"No values to simulate for {feature}")
+    if len(values) > MAX_SIMULATION_POINTS:
+        raise ValueError(f"{feature} has {len(values)} values, maximum is {MAX_SIMULATION_POINTS}")
+    return values
+
+# Helper: One record per grid point, first feature varying slowest
+def build_simulation_grid(student, ranges):
+    if not 1 <= len(ranges) <= 2:
+        raise ValueError("SIMULATE takes ranges for one or two features")
+
+    features = list(ranges)
+    axes = {feature: build_axis(feature, ranges[feature]) for feature in features}
+
+    points = 1
+    for values in axes.values():
+        points *= len(values)
+    if points > MAX_SIMULATION_POINTS:
+        raise ValueError(f"Simulation grid has {points} points, maximum is {MAX_SIMULATION_POINTS}")
+
+    records = []
+    if len(features) == 1:
+        for value in axes[features[0]]:
+            records.append({**student, features[0]: value})
+    else:
+        for first in axes[features[0]]:
+            for second in axes[features[1]]:
+                records.append({**student, features[0]: first, features[1]: second})
+    return features, axes, records
+
 # Lambda handler
 def lambda_handler(event, context):
     try:
         operation = event.get("operation")
         data = event.get("data")
+        explain = bool(event.get("explain", False))
 
-        if operation not in ["CREATE", "READ", "UPDATE", "DELETE"]:
+        if operation not in ["CREATE", "READ", "UPDATE", "DELETE", "SIMULATE", "DRIFT", "AGGREGATES"]:
             return {"success": False, "error": f"Unsupported operation: {operation}"}
 
         # ----------------------
@@ -32,13 +188,7 @@ def lambda_handler(event, context):
         # ----------------------
         if operation == "CREATE":
             # Call SageMaker for prediction
-            payload = json.dumps([data])  # list of dicts
-            sm_response = runtime.invoke_endpoint(
-                EndpointName=sagemaker_endpoint,
-                ContentType="application/json",
-                Body=payload
-            )
-            sm_result = json.loads(sm_response["Body"].read().decode("utf-8"))
+            sm_result = invoke_model([data], explain=explain)
             prediction = sm_result.get("prediction", [None])[0]
 
             # Save to DynamoDB
@@ -47,8 +197,12 @@ def lambda_handler(event, context):
                 item["Predicted_Final_Score"] = Decimal(str(prediction))
             item = convert_to_decimal(item)
             table.put_item(Item=item)
+            record_drift(data)
 
-            return {"success": True, "message": "Student created", "prediction": [prediction]}
+            response = {"success": True, "message": "Student created", "prediction": [prediction]}
+            if explain:
+                response["explanation"] = sm_result.get("explanation", [None])
+            return response
 
         # ----------------------
         # READ
@@ -66,6 +220,12 @@ def lambda_handler(event, context):
                 for k, v in item.items():
                     if isinstance(v, Decimal):
                         item[k] = float(v)
+
+            # Explain stored students with a single batched model call
+            if explain and items:
+                sm_result = invoke_model(items, explain=True)
+                for item, explanation in zip(items, sm_result.get("explanation", [])):
+                    item["Explanation"] = explanation
             return {"success": True, "data": items}
 
         # ----------------------
@@ -77,13 +237,7 @@ def lambda_handler(event, context):
                 return {"success": False, "error": "StudentID is required for update"}
 
             # Call SageMaker for prediction
-            payload = json.dumps([data])
-            sm_response = runtime.invoke_endpoint(
-                EndpointName=sagemaker_endpoint,
-                ContentType="application/json",
-                Body=payload
-            )
-            sm_result = json.loads(sm_response["Body"].read().decode("utf-8"))
+            sm_result = invoke_model([data])
             prediction = sm_result.get("prediction", [None])[0]
 
             # Update DynamoDB
@@ -99,6 +253,7 @@ def lambda_handler(event, context):
                 UpdateExpression=update_expr,
                 ExpressionAttributeValues=expr_values
             )
+            record_drift(data)
 
             return {"success": True, "message": "Student updated", "prediction": [prediction]}
 
@@ -113,5 +268,69 @@ def lambda_handler(event, context):
             table.delete_item(Key={"StudentID": student_id})
             return {"success": True, "message": "Student deleted"}
 
+        # ----------------------
+        # SIMULATE (what-if, nothing is stored)
+        # ----------------------
+        elif operation == "SIMULATE":
+            ranges = event.get("ranges") or {}
+
+            # A bare StudentID means simulate around the stored student
+            student = dict(data)
+            if set(student) == {"StudentID"}:
+                response = table.get_item(Key={"StudentID": student["StudentID"]})
+                if "Item" not in response:
+                    return {"success": False, "error": f"Student {student['StudentID']} not found"}
+                student = {k: float(v) if isinstance(v, Decimal) else v
+                           for k, v in response["Item"].items()}
+            student.pop("Predicted_Final_Score", None)
+
+            features, axes, records = build_simulation_grid(student, ranges)
+
+            # Score the whole grid in one call
+            sm_result = invoke_model(records)
+            predictions = sm_result.get("prediction", [])
+            if "error" in sm_result or len(predictions) != len(records):
+                raise ValueError(f"Model returned {len(predictions)} predictions for {len(records)} grid points")
+            if len(features) == 2:
+                width = len(axes[features[1]])
+                predictions = [predictions[i:i + width] for i in range(0, len(predictions), width)]
+
+            return {"success": True, "features": features, "axes": axes, "prediction": predictions}
+
+        # ----------------------
+        # DRIFT (live requests vs. training data)
+        # ----------------------
+        elif operation == "DRIFT":
+            if not drift_reference_uri:
+                return {"success": False, "error": "Drift tracking is not configured (DRIFT_REFERENCE_URI)"}
+
+            reference = load_drift_reference()
+            flush_drift()
+            response = aggregates_table.get_item(Key={"AggregateID": DRIFT_LIVE_ID}, ConsistentRead=True)
+            live = {k: v for k, v in response.get("Item", {}).items() if k != "AggregateID"}
+            report = drift.drift_report(reference, drift.DriftSketch.from_flat(reference, live))
+
+            if report["retrain"]:
+                aggregates_table.put_item(Item={
+                    "AggregateID": DRIFT_RETRAIN_ID,
+                    "Retrain": True,
+                    "Drifted": report["drifted"],
+                    "CheckedAt": int(time.time())
+                })
+
+            # Start a new window, e.g. after the model has been retrained
+            if event.get("reset"):
+                aggregates_table.delete_item(Key={"AggregateID": DRIFT_LIVE_ID})
+                aggregates_table.delete_item(Key={"AggregateID": DRIFT_RETRAIN_ID})
+
+            return {"success": True, "drift": report}
+
+        # ----------------------
+        # AGGREGATES (dashboard numbers kept by stream_handler.py, no scan)
+        # ----------------------
+        elif operation == "AGGREGATES":
+            aggregates, _ = stream_handler.store.load_aggregates()
+            return {"success": True, "aggregates": stream_handler.summarize(aggregates)}
+
     except Exception as e:
         return {"success": False, "error": str(e), "prediction": [None]}
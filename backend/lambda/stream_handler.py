@@ -0,0 +1,410 @@
+import copy
+import gzip
+import json
+import os
+from decimal import Decimal
+import boto3
+from boto3.dynamodb.types import TypeDeserializer
+
+# Consumes the DynamoDB stream of StudentPerformancePredictions (view type
+# NEW_AND_OLD_IMAGES). Keeps dashboard aggregates up to date and appends
+# every change to a columnar export, so neither needs a full table scan.
+
+# ----------------------
+# AWS Clients
+# ----------------------
+dynamodb = boto3.resource("dynamodb", region_name="ap-southeast-1")
+aggregates_table = dynamodb.Table("StudentPerformanceAggregates")
+students_table = dynamodb.Table("StudentPerformancePredictions")
+
+s3 = boto3.client("s3", region_name="ap-southeast-1")
+export_bucket = os.environ.get("EXPORT_BUCKET", "g30-student-performance-analysis")
+export_prefix = os.environ.get("EXPORT_PREFIX", "exports/student-performance")
+
+AGGREGATE_ID = "dashboard"
+CHECKPOINT_PREFIX = "checkpoint#"
+TRANSACTION_RECORDS = 99     # DynamoDB transactions hold 100 items: the aggregate + checkpoints
+MAX_COMMIT_ATTEMPTS = 5
+
+EXPORT_COLUMNS = [
+    "StudentID", "SequenceNumber", "EventName",
+    "Gender", "Study_Hours_per_Week", "Attendance_Rate", "Midterm_Exam_Scores",
+    "Parental_Education_Level", "Internet_Access_at_Home", "Extracurricular_Activities",
+    "Predicted_Final_Score",
+]
+
+deserializer = TypeDeserializer()
+
+
+class CommitConflict(Exception):
+    """Another consumer updated the aggregates since they were loaded."""
+
+
+# ----------------------
+# Aggregate state stores
+# ----------------------
+class DynamoAggregateStore:
+    """Aggregates and per-student checkpoints in one DynamoDB table, committed together."""
+
+    def __init__(self, table):
+        self.table = table
+
+    def load_aggregates(self):
+        response = self.table.get_item(Key={"AggregateID": AGGREGATE_ID}, ConsistentRead=True)
+        if "Item" not in response:
+            return empty_aggregates(), 0
+        item = response["Item"]
+        return item["Aggregates"], int(item["Version"])
+
+    def load_checkpoints(self, student_ids):
+        checkpoints = {}
+        keys = [{"AggregateID": CHECKPOINT_PREFIX + student_id} for student_id in student_ids]
+        client = self.table.meta.client
+        while keys:
+            response = client.batch_get_item(RequestItems={
+                self.table.name: {"Keys": keys[:100], "ConsistentRead": True}
+            })
+            for item in response["Responses"].get(self.table.name, []):
+                checkpoints[item["AggregateID"][len(CHECKPOINT_PREFIX):]] = int(item["SequenceNumber"])
+            unprocessed = response.get("UnprocessedKeys", {}).get(self.table.name, {}).get("Keys", [])
+            keys = unprocessed + keys[100:]
+        return checkpoints
+
+    def commit(self, aggregates, version, checkpoints):
+        if version == 0:
+            condition = {"ConditionExpression": "attribute_not_exists(AggregateID)"}
+        else:
+            condition = {"ConditionExpression": "Version = :version",
+                         "ExpressionAttributeValues": {":version": version}}
+        items = [{"Put": {
+            "TableName": self.table.name,
+            "Item": {"AggregateID": AGGREGATE_ID, "Aggregates": aggregates, "Version": version + 1},
+            **condition,
+        }}]
+        for student_id, sequence in checkpoints.items():
+            items.append({"Put": {
+                "TableName": self.table.name,
+                "Item": {"AggregateID": CHECKPOINT_PREFIX + student_id, "SequenceNumber": str(sequence)},
+            }})
+
+        client = self.table.meta.client
+        try:
+            client.transact_write_items(TransactItems=items)
+        except client.exceptions.TransactionCanceledException as e:
+            raise CommitConflict(str(e))
+
+
+class MemoryAggregateStore:
+    """In-process store for running the consumer locally and in tests."""
+
+    def __init__(self):
+        self.aggregates = empty_aggregates()
+        self.version = 0
+        self.checkpoints = {}
+
+    def load_aggregates(self):
+        return copy.deepcopy(self.aggregates), self.version
+
+    def load_checkpoints(self, student_ids):
+        return {s: self.checkpoints[s] for s in student_ids if s in self.checkpoints}
+
+    def commit(self, aggregates, version, checkpoints):
+        if version != self.version:
+            raise CommitConflict(f"Expected version {version}, found {self.version}")
+        self.aggregates = copy.deepcopy(aggregates)
+        self.version = version + 1
+        self.checkpoints.update(checkpoints)
+
+
+# ----------------------
+# Export sinks
+# ----------------------
+class S3ExportSink:
+    def __init__(self, client, bucket, prefix):
+        self.client, self.bucket, self.prefix = client, bucket, prefix
+
+    def write(self, name, body):
+        self.client.put_object(Bucket=self.bucket, Key=f"{self.prefix}/{name}", Body=body)
+
+    def read(self, name):
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=f"{self.prefix}/{name}")
+        except self.client.exceptions.NoSuchKey:
+            return None
+        return response["Body"].read()
+
+    def list(self, prefix):
+        names = []
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=f"{self.prefix}/{prefix}"):
+            names.extend(obj["Key"][len(self.prefix) + 1:] for obj in page.get("Contents", []))
+        return sorted(names)
+
+    def delete(self, name):
+        self.client.delete_object(Bucket=self.bucket, Key=f"{self.prefix}/{name}")
+
+
+class LocalExportSink:
+    def __init__(self, directory):
+        self.directory = directory
+
+    def write(self, name, body):
+        path = os.path.join(self.directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(body)
+
+    def read(self, name):
+        path = os.path.join(self.directory, name)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def list(self, prefix):
+        folder = os.path.join(self.directory, os.path.dirname(prefix))
+        if not os.path.isdir(folder):
+            return []
+        names = [os.path.join(os.path.dirname(prefix), name) for name in os.listdir(folder)]
+        return sorted(name for name in names if name.startswith(prefix))
+
+    def delete(self, name):
+        os.remove(os.path.join(self.directory, name))
+
+
+store = DynamoAggregateStore(aggregates_table)
+export_sink = S3ExportSink(s3, export_bucket, export_prefix)
+
+
+# ----------------------
+# Aggregates
+# ----------------------
+def empty_aggregates():
+    return {
+        "count": 0,
+        "score_count": 0,
+        "score_sum": Decimal(0),
+        "attendance_count": 0,
+        "attendance_sum": Decimal(0),
+        "histogram": {},               # score bucket ("0", "10", ... "90") -> count
+        "by_parental_education": {},   # level -> {"count", "score_count", "score_sum"}
+    }
+
+
+def score_bucket(score):
+    return str(min(max(int(score) // 10, 0), 9) * 10)
+
+
+def increment(mapping, key, amount):
+    mapping[key] = mapping.get(key, 0) + amount
+    if mapping[key] == 0:
+        del mapping[key]
+
+
+def apply_item(aggregates, item, sign):
+    """Add (sign=1) or remove (sign=-1) one student's row."""
+    score = item.get("Predicted_Final_Score")
+    attendance = item.get("Attendance_Rate")
+
+    aggregates["count"] += sign
+    if score is not None:
+        aggregates["score_count"] += sign
+        aggregates["score_sum"] += sign * Decimal(str(score))
+        increment(aggregates["histogram"], score_bucket(score), sign)
+    if attendance is not None:
+        aggregates["attendance_count"] += sign
+        aggregates["attendance_sum"] += sign * Decimal(str(attendance))
+
+    level = item.get("Parental_Education_Level")
+    if level is not None:
+        group = aggregates["by_parental_education"].setdefault(
+            level, {"count": 0, "score_count": 0, "score_sum": Decimal(0)})
+        group["count"] += sign
+        if score is not None:
+            group["score_count"] += sign
+            group["score_sum"] += sign * Decimal(str(score))
+        if group["count"] == 0:
+            del aggregates["by_parental_education"][level]
+
+
+def apply_change(aggregates, change):
+    if change["event"] in ("MODIFY", "REMOVE"):
+        if change["old"] is None:
+            raise ValueError("Stream must use NEW_AND_OLD_IMAGES to maintain aggregates")
+        apply_item(aggregates, change["old"], -1)
+    if change["event"] in ("INSERT", "MODIFY"):
+        apply_item(aggregates, change["new"], 1)
+
+
+def mean(total, count):
+    return float(total) / float(count) if count else None
+
+
+def summarize(aggregates):
+    """JSON-friendly dashboard metrics from stored aggregates."""
+    return {
+        "count": int(aggregates["count"]),
+        "mean_score": mean(aggregates["score_sum"], aggregates["score_count"]),
+        "mean_attendance": mean(aggregates["attendance_sum"], aggregates["attendance_count"]),
+        "histogram": {bucket: int(n) for bucket, n in sorted(aggregates["histogram"].items(), key=lambda kv: int(kv[0]))},
+        "by_parental_education": {
+            level: {"count": int(group["count"]),
+                    "mean_score": mean(group["score_sum"], group["score_count"])}
+            for level, group in sorted(aggregates["by_parental_education"].items())
+        },
+    }
+
+
+# ----------------------
+# Stream records
+# ----------------------
+def deserialize(image):
+    if image is None:
+        return None
+    return {k: deserializer.deserialize(v) for k, v in image.items()}
+
+
+def parse_record(record):
+    change = record["dynamodb"]
+    return {
+        "event": record["eventName"],
+        "key": deserialize(change["Keys"])["StudentID"],
+        "sequence": int(change["SequenceNumber"]),
+        "new": deserialize(change.get("NewImage")),
+        "old": deserialize(change.get("OldImage")),
+    }
+
+
+def apply_changes(changes):
+    """Fold a chunk of changes into the aggregates; skips anything already applied."""
+    for _ in range(MAX_COMMIT_ATTEMPTS):
+        aggregates, version = store.load_aggregates()
+        checkpoints = store.load_checkpoints({c["key"] for c in changes})
+
+        updated, applied = {}, 0
+        for change in changes:
+            if change["sequence"] <= updated.get(change["key"], checkpoints.get(change["key"], -1)):
+                continue    # replayed record
+            apply_change(aggregates, change)
+            updated[change["key"]] = change["sequence"]
+            applied += 1
+
+        if not updated:
+            return 0
+        try:
+            store.commit(aggregates, version, updated)
+            return applied
+        except CommitConflict:
+            continue
+    raise CommitConflict(f"Gave up after {MAX_COMMIT_ATTEMPTS} attempts")
+
+
+# ----------------------
+# Columnar export
+# ----------------------
+def to_export_value(value):
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def encode_columns(rows):
+    data = {column: [to_export_value(row.get(column)) for row in rows] for column in EXPORT_COLUMNS}
+    return gzip.compress(json.dumps({"columns": EXPORT_COLUMNS, "data": data}).encode("utf-8"), mtime=0)
+
+
+def decode_columns(body):
+    table = json.loads(gzip.decompress(body).decode("utf-8"))
+    data = table["data"]
+    return [dict(zip(table["columns"], values)) for values in zip(*(data[c] for c in table["columns"]))]
+
+
+def export_changes(changes, name=None):
+    """Write the batch as one compacted part: the latest change per student.
+
+    The part name comes from the batch's sequence numbers, so a replayed batch
+    overwrites its own part instead of adding a duplicate.
+    """
+    latest = {}
+    for change in changes:
+        if change["sequence"] > latest.get(change["key"], {}).get("SequenceNumber", -1):
+            row = dict(change["new"] or {"StudentID": change["key"]})
+            row.update(SequenceNumber=change["sequence"], EventName=change["event"])
+            latest[change["key"]] = row
+
+    if name is None:
+        first = min(c["sequence"] for c in changes)
+        last = max(c["sequence"] for c in changes)
+        name = f"changes/part-{first:024d}-{last:024d}.json.gz"
+    export_sink.write(name, encode_columns(list(latest.values())))
+    return name
+
+
+def compact_export(sink=None):
+    """Merge all change parts into snapshot.json.gz, keeping the latest row per student.
+
+    Deleted students stay in the snapshot as REMOVE rows so a late, older part
+    can't bring them back; filter on EventName when reading.
+    """
+    sink = sink or export_sink
+    snapshot = sink.read("snapshot.json.gz")
+    latest = {row["StudentID"]: row for row in decode_columns(snapshot)} if snapshot else {}
+
+    parts = sink.list("changes/")
+    for name in parts:
+        for row in decode_columns(sink.read(name)):
+            current = latest.get(row["StudentID"])
+            if current is None or row["SequenceNumber"] > current["SequenceNumber"]:
+                latest[row["StudentID"]] = row
+
+    rows = sorted(latest.values(), key=lambda row: row["StudentID"])
+    sink.write("snapshot.json.gz", encode_columns(rows))
+    for name in parts:
+        sink.delete(name)
+    return len(rows)
+
+
+# ----------------------
+# Backfill
+# ----------------------
+def backfill_aggregates(table=None):
+    """Fold the rows already in StudentPerformancePredictions into the aggregates.
+
+    Run once before enabling the stream trigger. Each row is applied as an
+    INSERT with sequence number 0, so re-running is a no-op and every real
+    stream record supersedes it. Rows are also written as export parts.
+    """
+    table = table or students_table
+    applied, chunk_index = 0, 0
+    scan_kwargs = {}
+    while True:
+        response = table.scan(**scan_kwargs)
+        changes = [{"event": "INSERT", "key": item["StudentID"], "sequence": 0, "new": item, "old": None}
+                   for item in response.get("Items", [])]
+        for start in range(0, len(changes), TRANSACTION_RECORDS):
+            chunk = changes[start:start + TRANSACTION_RECORDS]
+            export_changes(chunk, name=f"changes/backfill-{chunk_index:08d}.json.gz")
+            applied += apply_changes(chunk)
+            chunk_index += 1
+        if "LastEvaluatedKey" not in response:
+            return applied
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+# Lambda handler (DynamoDB Streams trigger)
+def stream_handler(event, context):
+    # Errors are raised rather than returned so Lambda retries the batch;
+    # checkpoints make the retry safe.
+    changes = [parse_record(record) for record in event.get("Records", [])]
+    if not changes:
+        return {"success": True, "processed": 0, "skipped": 0}
+
+    export_changes(changes)
+
+    applied = 0
+    for start in range(0, len(changes), TRANSACTION_RECORDS):
+        applied += apply_changes(changes[start:start + TRANSACTION_RECORDS])
+
+    return {"success": True, "processed": applied, "skipped": len(changes) - applied}
+
+
+if __name__ == "__main__":
+    print(f"✅ Backfilled {backfill_aggregates()} students into the aggregates")
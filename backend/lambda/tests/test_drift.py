@@ -0,0 +1,89 @@
+import random
+
+import drift
+
+
+def make_columns(n, seed=0, hours_shift=0.0, internet_yes=0.8):
+    rng = random.Random(seed)
+    return {
+        "Study_Hours_per_Week": [rng.uniform(10, 40) + hours_shift for _ in range(n)],
+        "Attendance_Rate": [rng.uniform(50, 100) for _ in range(n)],
+        "Midterm_Exam_Scores": [rng.randint(40, 100) for _ in range(n)],
+        "Gender": [rng.choice(["Male", "Female"]) for _ in range(n)],
+        "Parental_Education_Level": [rng.choice(["High School", "Bachelors", "Masters", "PhD"]) for _ in range(n)],
+        "Internet_Access_at_Home": ["Yes" if rng.random() < internet_yes else "No" for _ in range(n)],
+        "Extracurricular_Activities": [rng.choice(["Yes", "No"]) for _ in range(n)],
+    }
+
+
+def live_sketch(reference, columns):
+    sketch = drift.DriftSketch(reference)
+    for i in range(len(columns["Gender"])):
+        sketch.update({feature: values[i] for feature, values in columns.items()})
+    return sketch
+
+
+# ---------------------------
+# TEST: reference sketch
+# ---------------------------
+def test_build_reference():
+    reference = drift.build_reference(make_columns(1000))
+
+    hours = reference["Study_Hours_per_Week"]
+    assert len(hours["edges"]) == drift.REFERENCE_BINS - 1
+    assert sum(hours["counts"]) == 1000
+    assert max(hours["counts"]) - min(hours["counts"]) <= 2
+
+    # Integer-valued features collapse duplicate edges
+    assert sorted(reference["Midterm_Exam_Scores"]["edges"]) == reference["Midterm_Exam_Scores"]["edges"]
+    assert set(reference["Gender"]["counts"]) == {"Male", "Female"}
+
+
+# ---------------------------
+# TEST: same distribution -> no drift
+# ---------------------------
+def test_no_drift():
+    reference = drift.build_reference(make_columns(2000, seed=0))
+    report = drift.drift_report(reference, live_sketch(reference, make_columns(500, seed=1)))
+
+    assert report["retrain"] is False
+    assert all(stats["psi"] < drift.PSI_THRESHOLD for stats in report["features"].values())
+
+
+# ---------------------------
+# TEST: shifted numeric and categorical features -> retrain
+# ---------------------------
+def test_drift_detected():
+    reference = drift.build_reference(make_columns(2000, seed=0))
+    report = drift.drift_report(reference, live_sketch(reference, make_columns(500, seed=1, hours_shift=8, internet_yes=0.3)))
+
+    assert report["retrain"] is True
+    assert set(report["drifted"]) == {"Study_Hours_per_Week", "Internet_Access_at_Home"}
+    assert report["features"]["Study_Hours_per_Week"]["p_value"] < drift.KS_P_VALUE
+
+
+# ---------------------------
+# TEST: too few live samples never trigger retrain
+# ---------------------------
+def test_drift_needs_samples():
+    reference = drift.build_reference(make_columns(2000, seed=0))
+    report = drift.drift_report(reference, live_sketch(reference, make_columns(20, seed=1, hours_shift=30)))
+
+    assert report["features"]["Study_Hours_per_Week"]["psi"] >= drift.PSI_THRESHOLD
+    assert report["retrain"] is False
+
+
+# ---------------------------
+# TEST: sketches merge and round-trip through the flat form
+# ---------------------------
+def test_merge_and_flat():
+    reference = drift.build_reference(make_columns(1000))
+    first = live_sketch(reference, make_columns(100, seed=1))
+    second = live_sketch(reference, make_columns(50, seed=2))
+    second.update({"Gender": "Unknown"})
+
+    merged = drift.DriftSketch.from_flat(reference, first.to_flat()).merge(second)
+
+    assert merged.total("Study_Hours_per_Week") == 150
+    assert merged.total("Gender") == 151
+    assert merged.counts["Gender"][drift.OTHER] == 1
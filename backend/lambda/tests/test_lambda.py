@@ -81,3 +81,321 @@ def test_delete_student(mock_table):
 
     mock_table.delete_item.assert_called_once()
     assert response["success"] is True
+
+
+# ---------------------------
+# TEST: CREATE against a local inference server
+# ---------------------------
+@patch("handler.inference_url", "http://localhost:8080")
+@patch("handler.urllib.request.urlopen")
+@patch("handler.runtime")
+@patch("handler.table")
+def test_create_student_local_server(mock_table, mock_runtime, mock_urlopen):
+    mock_urlopen.return_value.__enter__.return_value = MagicMock(read=lambda: b'{"prediction": [72]}')
+
+    event = {
+        "operation": "CREATE",
+        "data": {"StudentID": "1", "Hours_Studied": 5.0}
+    }
+
+    response = handler.lambda_handler(event, None)
+
+    request = mock_urlopen.call_args[0][0]
+    assert request.full_url == "http://localhost:8080/invocations"
+    assert mock_urlopen.call_args.kwargs["timeout"] == handler.inference_timeout
+    mock_runtime.invoke_endpoint.assert_not_called()
+    assert response["success"] is True
+    assert response["prediction"] == [72]
+
+
+# ---------------------------
+# TEST: CREATE with explanation
+# ---------------------------
+@patch("handler.runtime")
+@patch("handler.table")
+def test_create_student_explain(mock_table, mock_runtime):
+    mock_runtime.invoke_endpoint.return_value = {
+        "Body": MagicMock(read=lambda: b'{"prediction": [85], "explanation": [{"bias": 80, "contributions": {"Hours_Studied": 5}}]}')
+    }
+
+    event = {
+        "operation": "CREATE",
+        "explain": True,
+        "data": {"StudentID": "1", "Hours_Studied": 5.0}
+    }
+
+    response = handler.lambda_handler(event, None)
+
+    payload = json.loads(mock_runtime.invoke_endpoint.call_args.kwargs["Body"])
+    assert payload == {"instances": [{"StudentID": "1", "Hours_Studied": 5.0}], "explain": True}
+    assert response["prediction"] == [85]
+    assert response["explanation"][0]["contributions"] == {"Hours_Studied": 5}
+
+
+# ---------------------------
+# TEST: READ (all) with explanation
+# ---------------------------
+@patch("handler.runtime")
+@patch("handler.table")
+def test_read_all_explain(mock_table, mock_runtime):
+    mock_table.scan.return_value = {
+        "Items": [
+            {"StudentID": "1", "Hours_Studied": Decimal("5")},
+            {"StudentID": "2", "Hours_Studied": Decimal("7")},
+        ]
+    }
+    mock_runtime.invoke_endpoint.return_value = {
+        "Body": MagicMock(read=lambda: b'{"prediction": [70, 75], "explanation": [{"bias": 72}, {"bias": 72}]}')
+    }
+
+    event = {"operation": "READ", "explain": True, "data": {}}
+
+    response = handler.lambda_handler(event, None)
+
+    mock_runtime.invoke_endpoint.assert_called_once()
+    assert response["success"] is True
+    assert [item["Explanation"] for item in response["data"]] == [{"bias": 72}, {"bias": 72}]
+
+
+# ---------------------------
+# TEST: a model error fails the request and stores nothing
+# ---------------------------
+@patch("handler.runtime")
+@patch("handler.table")
+def test_create_student_model_error(mock_table, mock_runtime):
+    mock_runtime.invoke_endpoint.return_value = {
+        "Body": MagicMock(read=lambda: b'{"error": "bad columns"}')
+    }
+
+    event = {"operation": "CREATE", "data": {"StudentID": "1", "Hours_Studied": 5.0}}
+
+    response = handler.lambda_handler(event, None)
+
+    mock_table.put_item.assert_not_called()
+    assert response["success"] is False
+    assert "bad columns" in response["error"]
+
+
+@patch("handler.runtime")
+@patch("handler.table")
+def test_read_all_explain_model_error(mock_table, mock_runtime):
+    mock_table.scan.return_value = {"Items": [{"StudentID": "1", "Hours_Studied": Decimal("5")}]}
+    mock_runtime.invoke_endpoint.return_value = {
+        "Body": MagicMock(read=lambda: b'{"error": "bad columns"}')
+    }
+
+    response = handler.lambda_handler({"operation": "READ", "explain": True, "data": {}}, None)
+
+    assert response["success"] is False
+
+
+# ---------------------------
+# TEST: SIMULATE (one feature)
+# ---------------------------
+@patch("handler.runtime")
+@patch("handler.table")
+def test_simulate_one_feature(mock_table, mock_runtime):
+    mock_runtime.invoke_endpoint.return_value = {
+        "Body": MagicMock(read=lambda: b'{"prediction": [50, 55, 60]}')
+    }
+
+    event = {
+        "operation": "SIMULATE",
+        "data": {"StudentID": "1", "Study_Hours_per_Week": 10.0, "Attendance_Rate": 80.0},
+        "ranges": {"Study_Hours_per_Week": {"min": 10, "max": 30, "steps": 3}}
+    }
+
+    response = handler.lambda_handler(event, None)
+
+    payload = json.loads(mock_runtime.invoke_endpoint.call_args.kwargs["Body"])
+    assert [r["Study_Hours_per_Week"] for r in payload] == [10.0, 20.0, 30.0]
+    assert all(r["Attendance_Rate"] == 80.0 for r in payload)
+    mock_table.put_item.assert_not_called()
+    mock_table.update_item.assert_not_called()
+    assert response["success"] is True
+    assert response["axes"] == {"Study_Hours_per_Week": [10.0, 20.0, 30.0]}
+    assert response["prediction"] == [50, 55, 60]
+
+
+# ---------------------------
+# TEST: SIMULATE (two features, stored student)
+# ---------------------------
+@patch("handler.runtime")
+@patch("handler.table")
+def test_simulate_two_features(mock_table, mock_runtime):
+    mock_table.get_item.return_value = {
+        "Item": {"StudentID": "1", "Study_Hours_per_Week": Decimal("10"),
+                 "Internet_Access_at_Home": "No", "Predicted_Final_Score": Decimal("50")}
+    }
+    mock_runtime.invoke_endpoint.return_value = {
+        "Body": MagicMock(read=lambda: b'{"prediction": [1, 2, 3, 4]}')
+    }
+
+    event = {
+        "operation": "SIMULATE",
+        "data": {"StudentID": "1"},
+        "ranges": {
+            "Study_Hours_per_Week": {"min": 0, "max": 40, "steps": 2},
+            "Internet_Access_at_Home": {"values": ["Yes", "No"]}
+        }
+    }
+
+    response = handler.lambda_handler(event, None)
+
+    payload = json.loads(mock_runtime.invoke_endpoint.call_args.kwargs["Body"])
+    assert len(payload) == 4
+    assert "Predicted_Final_Score" not in payload[0]
+    assert response["success"] is True
+    assert response["features"] == ["Study_Hours_per_Week", "Internet_Access_at_Home"]
+    assert response["prediction"] == [[1, 2], [3, 4]]
+
+
+# ---------------------------
+# TEST: SIMULATE grid too large
+# ---------------------------
+@patch("handler.runtime")
+def test_simulate_grid_too_large(mock_runtime):
+    event = {
+        "operation": "SIMULATE",
+        "data": {"Study_Hours_per_Week": 10.0},
+        "ranges": {
+            "Study_Hours_per_Week": {"min": 0, "max": 100, "steps": 1000},
+            "Attendance_Rate": {"min": 0, "max": 100, "steps": 1000}
+        }
+    }
+
+    response = handler.lambda_handler(event, None)
+
+    mock_runtime.invoke_endpoint.assert_not_called()
+    assert response["success"] is False
+
+
+# ---------------------------
+# TEST: SIMULATE rejects bad ranges before calling the model
+# ---------------------------
+@pytest.mark.parametrize("ranges", [
+    {"Study_Hourz": {"min": 0, "max": 10, "steps": 3}},
+    {"Study_Hours_per_Week": {"values": "abc"}},
+    {"Study_Hours_per_Week": {"values": [1, "2"]}},
+    {"Study_Hours_per_Week": {"min": "0", "max": 10, "steps": 3}},
+    {"Gender": {"min": 0, "max": 1, "steps": 2}},
+])
+@patch("handler.runtime")
+def test_simulate_invalid_ranges(mock_runtime, ranges):
+    event = {"operation": "SIMULATE", "data": {"Study_Hours_per_Week": 10.0}, "ranges": ranges}
+
+    response = handler.lambda_handler(event, None)
+
+    mock_runtime.invoke_endpoint.assert_not_called()
+    assert response["success"] is False
+
+
+# ---------------------------
+# TEST: SIMULATE fails when the model doesn't score the whole grid
+# ---------------------------
+@pytest.mark.parametrize("body", [b'{"prediction": [50, 55]}', b'{"error": "bad columns"}'])
+@patch("handler.runtime")
+def test_simulate_model_result_checked(mock_runtime, body):
+    mock_runtime.invoke_endpoint.return_value = {"Body": MagicMock(read=lambda: body)}
+    event = {
+        "operation": "SIMULATE",
+        "data": {"Study_Hours_per_Week": 10.0},
+        "ranges": {"Study_Hours_per_Week": {"min": 10, "max": 30, "steps": 3}}
+    }
+
+    response = handler.lambda_handler(event, None)
+
+    assert response["success"] is False
+
+
+# ---------------------------
+# TEST: CREATE counts the record for drift
+# ---------------------------
+@patch("handler.drift_reference_uri", "s3://bucket/drift_reference.json")
+@patch("handler.DRIFT_FLUSH_EVERY", 1)
+@patch("handler.drift_state", {"reference": None, "sketch": None, "pending": 0, "last_flush": 0})
+@patch("handler.s3")
+@patch("handler.aggregates_table")
+@patch("handler.runtime")
+@patch("handler.table")
+def test_create_records_drift(mock_table, mock_runtime, mock_aggregates, mock_s3):
+    reference = {"Gender": {"type": "categorical", "counts": {"Male": 5, "Female": 5}}}
+    mock_s3.get_object.return_value = {"Body": MagicMock(read=lambda: json.dumps(reference).encode("utf-8"))}
+    mock_runtime.invoke_endpoint.return_value = {
+        "Body": MagicMock(read=lambda: b'{"prediction": [85]}')
+    }
+
+    event = {"operation": "CREATE", "data": {"StudentID": "1", "Gender": "Male"}}
+
+    response = handler.lambda_handler(event, None)
+
+    kwargs = mock_aggregates.update_item.call_args.kwargs
+    assert response["success"] is True
+    assert kwargs["Key"] == {"AggregateID": "drift#live"}
+    assert kwargs["ExpressionAttributeNames"] == {"#c0": "Gender#Male"}
+    assert kwargs["ExpressionAttributeValues"] == {":c0": 1}
+
+
+# ---------------------------
+# TEST: DRIFT reports and raises the retrain flag
+# ---------------------------
+@patch("handler.drift_reference_uri", "s3://bucket/drift_reference.json")
+@patch("handler.drift_state", {"reference": None, "sketch": None, "pending": 0, "last_flush": 0})
+@patch("handler.s3")
+@patch("handler.aggregates_table")
+def test_drift_retrain_flag(mock_aggregates, mock_s3):
+    reference = {"Gender": {"type": "categorical", "counts": {"Male": 500, "Female": 500}}}
+    mock_s3.get_object.return_value = {"Body": MagicMock(read=lambda: json.dumps(reference).encode("utf-8"))}
+    mock_aggregates.get_item.return_value = {
+        "Item": {"AggregateID": "drift#live", "Gender#Male": Decimal("190"), "Gender#Female": Decimal("10")}
+    }
+
+    response = handler.lambda_handler({"operation": "DRIFT"}, None)
+
+    assert response["success"] is True
+    assert response["drift"]["retrain"] is True
+    assert response["drift"]["drifted"] == ["Gender"]
+    flag = mock_aggregates.put_item.call_args.kwargs["Item"]
+    assert flag["AggregateID"] == "drift#retrain"
+    assert flag["Retrain"] is True
+
+
+# ---------------------------
+# TEST: SIMULATE rejects a huge axis before building it
+# ---------------------------
+@patch("handler.runtime")
+def test_simulate_huge_steps(mock_runtime):
+    event = {
+        "operation": "SIMULATE",
+        "data": {"Study_Hours_per_Week": 10.0},
+        "ranges": {"Study_Hours_per_Week": {"min": 0, "max": 1, "steps": 10 ** 9}}
+    }
+
+    with patch("handler.range", side_effect=AssertionError("axis was built"), create=True):
+        response = handler.lambda_handler(event, None)
+
+    mock_runtime.invoke_endpoint.assert_not_called()
+    assert response["success"] is False
+    assert "maximum is 10000" in response["error"]
+
+
+# ---------------------------
+# TEST: AGGREGATES reads the stored aggregates, not the table
+# ---------------------------
+@patch("handler.table")
+def test_aggregates(mock_table):
+    aggregates = {
+        "count": Decimal("2"), "score_count": Decimal("2"), "score_sum": Decimal("130"),
+        "attendance_count": Decimal("2"), "attendance_sum": Decimal("170"),
+        "histogram": {"70": Decimal("1"), "60": Decimal("1")},
+        "by_parental_education": {},
+    }
+    with patch.object(handler.stream_handler, "store") as mock_store:
+        mock_store.load_aggregates.return_value = (aggregates, 3)
+        response = handler.lambda_handler({"operation": "AGGREGATES"}, None)
+
+    mock_table.scan.assert_not_called()
+    assert response["success"] is True
+    assert response["aggregates"]["count"] == 2
+    assert response["aggregates"]["mean_score"] == 65.0
+    assert response["aggregates"]["histogram"] == {"60": 1, "70": 1}
@@ -0,0 +1,180 @@
+import boto3
+import pytest
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+from boto3.dynamodb.types import TypeSerializer
+from moto import mock_aws
+
+import stream_handler
+
+serializer = TypeSerializer()
+
+
+def to_image(item):
+    return {k: serializer.serialize(Decimal(str(v)) if isinstance(v, float) else v) for k, v in item.items()}
+
+
+def stream_record(event_name, sequence, new=None, old=None):
+    student_id = (new or old)["StudentID"]
+    change = {"Keys": to_image({"StudentID": student_id}), "SequenceNumber": str(sequence)}
+    if new is not None:
+        change["NewImage"] = to_image(new)
+    if old is not None:
+        change["OldImage"] = to_image(old)
+    return {"eventID": str(sequence), "eventName": event_name, "dynamodb": change}
+
+
+def student(student_id, score, attendance=80.0, education="PhD"):
+    return {"StudentID": student_id, "Predicted_Final_Score": score,
+            "Attendance_Rate": attendance, "Parental_Education_Level": education}
+
+
+@pytest.fixture
+def memory_stream(tmp_path):
+    store = stream_handler.MemoryAggregateStore()
+    sink = stream_handler.LocalExportSink(str(tmp_path))
+    with patch("stream_handler.store", store), patch("stream_handler.export_sink", sink):
+        yield store, sink
+
+
+# ---------------------------
+# TEST: INSERT / MODIFY / REMOVE maintain aggregates
+# ---------------------------
+def test_stream_aggregates(memory_stream):
+    store, _ = memory_stream
+    event = {"Records": [
+        stream_record("INSERT", 100, new=student("1", 55.0, 70.0, "PhD")),
+        stream_record("INSERT", 101, new=student("2", 65.0, 90.0, "Masters")),
+        stream_record("INSERT", 102, new=student("3", 75.0, 80.0, "PhD")),
+        stream_record("MODIFY", 103, new=student("1", 61.0, 70.0, "PhD"), old=student("1", 55.0, 70.0, "PhD")),
+        stream_record("REMOVE", 104, old=student("2", 65.0, 90.0, "Masters")),
+    ]}
+
+    response = stream_handler.stream_handler(event, None)
+    summary = stream_handler.summarize(store.aggregates)
+
+    assert response == {"success": True, "processed": 5, "skipped": 0}
+    assert summary["count"] == 2
+    assert summary["mean_score"] == 68.0
+    assert summary["mean_attendance"] == 75.0
+    assert summary["histogram"] == {"60": 1, "70": 1}
+    assert summary["by_parental_education"] == {"PhD": {"count": 2, "mean_score": 68.0}}
+
+
+# ---------------------------
+# TEST: replayed records are skipped
+# ---------------------------
+def test_stream_replay_is_idempotent(memory_stream):
+    store, _ = memory_stream
+    first = {"Records": [
+        stream_record("INSERT", 100, new=student("1", 55.0)),
+        stream_record("INSERT", 101, new=student("2", 65.0)),
+    ]}
+    replay = {"Records": first["Records"] + [stream_record("INSERT", 102, new=student("3", 75.0))]}
+
+    stream_handler.stream_handler(first, None)
+    stream_handler.stream_handler(first, None)
+    response = stream_handler.stream_handler(replay, None)
+
+    assert response == {"success": True, "processed": 1, "skipped": 2}
+    assert store.aggregates["count"] == 3
+    assert store.aggregates["score_sum"] == Decimal("195.0")
+
+
+# ---------------------------
+# TEST: export parts compact to the latest row per student
+# ---------------------------
+def test_stream_export_compaction(memory_stream):
+    _, sink = memory_stream
+    stream_handler.stream_handler({"Records": [
+        stream_record("INSERT", 100, new=student("1", 55.0)),
+        stream_record("INSERT", 101, new=student("2", 65.0)),
+    ]}, None)
+    stream_handler.stream_handler({"Records": [
+        stream_record("MODIFY", 102, new=student("1", 60.0), old=student("1", 55.0)),
+        stream_record("REMOVE", 103, old=student("2", 65.0)),
+    ]}, None)
+
+    assert len(sink.list("changes/part-")) == 2
+    stream_handler.compact_export(sink)
+
+    rows = stream_handler.decode_columns(sink.read("snapshot.json.gz"))
+    assert sink.list("changes/part-") == []
+    assert [(r["StudentID"], r["EventName"], r["Predicted_Final_Score"]) for r in rows] == [
+        ("1", "MODIFY", 60.0),
+        ("2", "REMOVE", None),
+    ]
+
+
+# ---------------------------
+# TEST: MODIFY without an old image is rejected
+# ---------------------------
+def test_stream_requires_old_images(memory_stream):
+    event = {"Records": [stream_record("MODIFY", 100, new=student("1", 60.0))]}
+
+    with pytest.raises(ValueError):
+        stream_handler.stream_handler(event, None)
+
+
+# ---------------------------
+# TEST: DynamoDB store commits aggregates and checkpoints together
+# ---------------------------
+@mock_aws
+def test_dynamo_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    table = boto3.resource("dynamodb", region_name="ap-southeast-1").create_table(
+        TableName="StudentPerformanceAggregates",
+        KeySchema=[{"AttributeName": "AggregateID", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "AggregateID", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    store = stream_handler.DynamoAggregateStore(table)
+    event = {"Records": [stream_record("INSERT", 100 + i, new=student(str(i), 60.0)) for i in range(150)]}
+
+    with patch("stream_handler.store", store), \
+            patch("stream_handler.export_sink", stream_handler.LocalExportSink(str(tmp_path))):
+        assert stream_handler.stream_handler(event, None)["processed"] == 150
+        assert stream_handler.stream_handler(event, None)["skipped"] == 150
+
+    aggregates, version = store.load_aggregates()
+    assert version == 2
+    assert stream_handler.summarize(aggregates)["count"] == 150
+    with pytest.raises(stream_handler.CommitConflict):
+        store.commit(aggregates, 1, {})
+
+
+# ---------------------------
+# TEST: backfill folds existing rows in once; the stream continues from there
+# ---------------------------
+def test_backfill_aggregates(memory_stream):
+    store, sink = memory_stream
+    existing = [
+        {"StudentID": "1", "Predicted_Final_Score": Decimal("55"), "Attendance_Rate": Decimal("70"),
+         "Parental_Education_Level": "PhD"},
+        {"StudentID": "2", "Predicted_Final_Score": Decimal("65"), "Attendance_Rate": Decimal("90"),
+         "Parental_Education_Level": "Masters"},
+    ]
+    table = MagicMock()
+    table.scan.side_effect = lambda **kwargs: (
+        {"Items": existing[1:]} if "ExclusiveStartKey" in kwargs
+        else {"Items": existing[:1], "LastEvaluatedKey": {"StudentID": "1"}}
+    )
+
+    assert stream_handler.backfill_aggregates(table) == 2
+    assert stream_handler.backfill_aggregates(table) == 0
+
+    stream_handler.stream_handler({"Records": [
+        stream_record("MODIFY", 100, new=student("1", 61.0, 70.0), old=student("1", 55.0, 70.0)),
+        stream_record("REMOVE", 101, old=student("2", 65.0, 90.0, "Masters")),
+    ]}, None)
+    summary = stream_handler.summarize(store.aggregates)
+
+    assert summary["count"] == 1
+    assert summary["mean_score"] == 61.0
+    assert summary["histogram"] == {"60": 1}
+    assert summary["by_parental_education"] == {"PhD": {"count": 1, "mean_score": 61.0}}
+
+    stream_handler.compact_export(sink)
+    rows = stream_handler.decode_columns(sink.read("snapshot.json.gz"))
+    assert [(r["StudentID"], r["EventName"]) for r in rows] == [("1", "MODIFY"), ("2", "REMOVE")]
@@ -1,9 +1,12 @@
 import streamlit as st
 import boto3
+import numpy as np
 import pandas as pd
 from decimal import Decimal
 import json
+import os
 import time
+import urllib.request
 import uuid
 
 # Page config
@@ -13,12 +16,17 @@ st.set_page_config(page_title="Student Performance Prediction", layout="wide", i
 def get_aws_clients():
     dynamodb = boto3.resource("dynamodb", region_name="ap-southeast-1")
     table = dynamodb.Table("StudentPerformancePredictions")
+    aggregates_table = dynamodb.Table("StudentPerformanceAggregates")
     runtime = boto3.client("sagemaker-runtime", region_name="ap-southeast-1")
-    return table, runtime
+    return table, aggregates_table, runtime
 
-table, runtime = get_aws_clients()
+table, aggregates_table, runtime = get_aws_clients()
 sagemaker_endpoint = "student-performance-model-endpoint"
 
+# Optional: point at a local inference server (ml_model/serve.py) instead of SageMaker
+inference_url = os.environ.get("INFERENCE_URL")
+inference_timeout = float(os.environ.get("INFERENCE_TIMEOUT", "5"))   # seconds
+
 # Helper Functions 
 def convert_to_decimal(item):
     for k, v in item.items():
@@ -34,15 +42,32 @@ def decimal_to_float(items):
     return items
 
 #SageMaker call
-def get_prediction(data):
-    try:
-        payload = json.dumps([data])
+def invoke_model(records):
+    payload = json.dumps(records)
+    if inference_url:
+        request = urllib.request.Request(
+            f"{inference_url.rstrip('/')}/invocations",
+            data=payload.encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=inference_timeout) as response:
+            result = json.loads(response.read().decode("utf-8"))
+    else:
         sm_response = runtime.invoke_endpoint(
             EndpointName=sagemaker_endpoint,
             ContentType="application/json",
             Body=payload
         )
-        sm_result = json.loads(sm_response["Body"].read().decode("utf-8"))
+        result = json.loads(sm_response["Body"].read().decode("utf-8"))
+
+    # A model failure must not be stored or returned as a result
+    if "error" in result:
+        raise ValueError(f"Model error: {result['error']}")
+    return result
+
+def get_prediction(data):
+    try:
+        sm_result = invoke_model([data])
         return sm_result.get("prediction", [None])[0]
     except Exception as e:
         st.error(f"Prediction error: {str(e)}")
@@ -58,6 +83,29 @@ def read_all():
         items.extend(response.get('Items', []))
     return pd.DataFrame(decimal_to_float(items))
 
+def mean(total, count):
+    return float(total) / float(count) if count else float("nan")
+
+# Dashboard numbers from the aggregates kept by backend/lambda/stream_handler.py,
+# falling back to the scanned rows when the stream consumer isn't set up
+def dashboard_metrics(df):
+    item = aggregates_table.get_item(Key={"AggregateID": "dashboard"}).get("Item")
+    if item is None:
+        return {
+            "count": len(df),
+            "mean_score": df["Predicted_Final_Score"].mean(),
+            "mean_attendance": df["Attendance_Rate"].mean(),
+            "top": len(df[df["Predicted_Final_Score"] >= 60]),
+        }
+    aggregates = item["Aggregates"]
+    return {
+        "count": int(aggregates["count"]),
+        "mean_score": mean(aggregates["score_sum"], aggregates["score_count"]),
+        "mean_attendance": mean(aggregates["attendance_sum"], aggregates["attendance_count"]),
+        # Histogram buckets are score // 10 * 10, so buckets from 60 up are scores >= 60
+        "top": sum(int(n) for bucket, n in aggregates["histogram"].items() if int(bucket) >= 60),
+    }
+
 def create_student(data):
     prediction = get_prediction(data)
     item = data.copy()
@@ -93,6 +141,20 @@ def update_student(student_id, data):
 def delete_student(student_id):
     table.delete_item(Key={"StudentID": student_id})
 
+def simulate(student, ranges):
+    """Score a what-if grid for one student in a single call. Nothing is stored."""
+    base = {k: v for k, v in student.items() if k != "Predicted_Final_Score"}
+    axes = {feature: np.linspace(low, high, steps).tolist() for feature, (low, high, steps) in ranges.items()}
+    grid = pd.MultiIndex.from_product(list(axes.values()), names=list(axes)).to_frame(index=False)
+    records = [{**base, **point} for point in grid.to_dict("records")]
+    try:
+        sm_result = invoke_model(records)
+    except Exception as e:
+        st.error(f"Prediction error: {str(e)}")
+        return None
+    grid["Predicted_Final_Score"] = sm_result.get("prediction", [None] * len(grid))
+    return grid
+
 def generate_student_id():
     return f"S{uuid.uuid4().hex[:3].upper()}"
 
@@ -108,6 +170,13 @@ desired_order = [
     "Predicted_Final_Score"
 ]
 
+# Numeric features that can be swept in the What-if tab: (min, max)
+simulation_features = {
+    "Study_Hours_per_Week": (0.0, 168.0),
+    "Attendance_Rate": (0.0, 100.0),
+    "Midterm_Exam_Scores": (0.0, 100.0),
+}
+
 
 
 
@@ -125,18 +194,18 @@ def main():
     
     df = read_all()
 
-    # Custom CSS for equal-width tabs (25% each)
+    # Custom CSS for equal-width tabs (20% each)
     st.markdown("""
         <style>
         div[data-baseweb="tab-list"] > div {
             flex: 1 !important;
-            max-width: 25% !important;
+            max-width: 20% !important;
         }
         </style>
     """, unsafe_allow_html=True)
 
     
-    tab1, tab2, tab3, tab4 = st.tabs(["📈 View All", "➕ Create", "✏️ Update", "❌ Delete"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📈 View All", "➕ Create", "✏️ Update", "❌ Delete", "🔮 What-if"])
 
     
     with tab1:
@@ -147,11 +216,12 @@ def main():
             st.success(f"✅ {len(df)} students loaded")
             
             # METRICS
+            metrics = dashboard_metrics(df)
             col1, col2, col3, col4 = st.columns(4)
-            with col1: st.metric("👥 Total", len(df))
-            with col2: st.metric("📈 Avg Score", f"{df['Predicted_Final_Score'].mean():.1f}")
-            with col3: st.metric("📊 Attendance", f"{df['Attendance_Rate'].mean():.1f}%")
-            with col4: st.metric("⭐ Top Students", len(df[df["Predicted_Final_Score"] >= 60]))
+            with col1: st.metric("👥 Total", metrics["count"])
+            with col2: st.metric("📈 Avg Score", f"{metrics['mean_score']:.1f}")
+            with col3: st.metric("📊 Attendance", f"{metrics['mean_attendance']:.1f}%")
+            with col4: st.metric("⭐ Top Students", metrics["top"])
 
             df = df[desired_order]   # Reorder the columns
             
@@ -309,5 +379,41 @@ def main():
                         time.sleep(4)
                         st.rerun()
 
+    with tab5:
+        st.subheader("🔮 What-if Simulation")
+        if df.empty:
+            st.warning("No students")
+        else:
+            student_id = st.selectbox("Student", df["StudentID"].tolist(), key="simulate_student")
+            if student_id:
+                student = df[df["StudentID"] == student_id].iloc[0].to_dict()
+                col1, col2 = st.columns(2)
+                with col1:
+                    feature = st.selectbox("Vary", list(simulation_features), key="simulate_feature")
+                    low, high = st.slider("Range", *simulation_features[feature],
+                                          value=simulation_features[feature], key="simulate_range")
+                    steps = st.number_input("Steps", min_value=2, max_value=1000, value=50, key="simulate_steps")
+                with col2:
+                    second = st.selectbox("And vary (optional)",
+                                          ["None"] + [f for f in simulation_features if f != feature],
+                                          key="simulate_second")
+                    if second != "None":
+                        second_low, second_high = st.slider("Second range", *simulation_features[second],
+                                                            value=simulation_features[second], key="simulate_second_range")
+                        second_steps = st.number_input("Second steps", min_value=2, max_value=10, value=5, key="simulate_second_steps")
+
+                if st.button("🔮 Simulate", type="primary"):
+                    ranges = {feature: (low, high, int(steps))}
+                    if second != "None":
+                        ranges[second] = (second_low, second_high, int(second_steps))
+                    with st.spinner("Simulating..."):
+                        grid = simulate(student, ranges)
+                    if grid is not None:
+                        if second == "None":
+                            st.line_chart(grid.set_index(feature)["Predicted_Final_Score"])
+                        else:
+                            st.line_chart(grid.pivot(index=feature, columns=second, values="Predicted_Final_Score"))
+                        st.caption(f"Current prediction: {student['Predicted_Final_Score']:.1f} pts")
+
 if __name__ == "__main__":
     main()
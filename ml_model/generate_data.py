@@ -0,0 +1,216 @@
+import argparse
+import os
+import time
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr
+
+# Synthetic students for scale testing.
+#
+# Fits a Gaussian copula to student_performance.csv: every column gets its
+# empirical marginal, and the rank (Spearman) correlations between them
+# (midterm, attendance, study hours and final score in particular) are
+# matched through the copula's 2*sin(pi*rho/6) relation. Categoricals are
+# thresholds on a latent normal, so they keep their exact frequencies and
+# take part in the correlation too.
+#
+# Output is a deterministic function of the seed: chunk size only changes
+# how rows are batched, never their values.
+#
+#   python ml_model/generate_data.py --rows 10000000 --seed 42 --output ml_model/data/synthetic.csv
+
+NUMERIC_FEATURES = ['Study_Hours_per_Week', 'Attendance_Rate', 'Midterm_Exam_Scores', 'Final_Exam_Score']
+CATEGORICAL_FEATURES = {
+    'Gender': ['Female', 'Male'],
+    'Parental_Education_Level': ['High School', 'Bachelors', 'Masters', 'PhD'],
+    'Internet_Access_at_Home': ['No', 'Yes'],
+    'Extracurricular_Activities': ['No', 'Yes'],
+}
+COLUMNS = [
+    'Student_ID', 'Gender', 'Study_Hours_per_Week', 'Attendance_Rate', 'Midterm_Exam_Scores',
+    'Parental_Education_Level', 'Internet_Access_at_Home', 'Extracurricular_Activities',
+    'Final_Exam_Score', 'Pass_Fail'
+]
+MAX_ROWS = 10 ** 8         # Student_IDs have 8 digits
+
+
+def fit(df):
+    """Copula parameters from a student_performance.csv DataFrame."""
+    latent_columns = NUMERIC_FEATURES + list(CATEGORICAL_FEATURES)
+
+    # Spearman correlation of (mid-)ranks; categoricals ranked in the order above
+    ranks = []
+    for column in latent_columns:
+        values = df[column]
+        if column in CATEGORICAL_FEATURES:
+            values = pd.Categorical(values, categories=CATEGORICAL_FEATURES[column], ordered=True).codes
+        ranks.append(pd.Series(values).rank(method='average').to_numpy())
+    spearman = np.corrcoef(np.column_stack(ranks), rowvar=False)
+
+    # Latent normal correlation whose samples have that Spearman correlation
+    # (using the normal scores directly left midterm vs final ~0.05 short)
+    correlation = 2 * np.sin(np.pi * spearman / 6)
+
+    # Clip to positive definite so the Cholesky factor exists
+    eigenvalues, eigenvectors = np.linalg.eigh(correlation)
+    correlation = eigenvectors @ np.diag(np.clip(eigenvalues, 1e-6, None)) @ eigenvectors.T
+    d = np.sqrt(np.diag(correlation))
+    correlation = correlation / np.outer(d, d)
+
+    categorical_cutoffs = {}
+    for column, categories in CATEGORICAL_FEATURES.items():
+        frequencies = df[column].value_counts(normalize=True).reindex(categories, fill_value=0).to_numpy()
+        categorical_cutoffs[column] = np.cumsum(frequencies)[:-1]
+
+    return {
+        'columns': latent_columns,
+        'cholesky': np.linalg.cholesky(correlation),
+        'sorted_values': {c: np.sort(df[c].to_numpy(dtype=float)) for c in NUMERIC_FEATURES},
+        'integer': {c: bool(np.all(df[c] == np.round(df[c]))) for c in NUMERIC_FEATURES},
+        'categorical_cutoffs': categorical_cutoffs,
+        'pass_score': df.loc[df['Pass_Fail'] == 'Pass', 'Final_Exam_Score'].min(),
+    }
+
+
+def empirical_quantile(sorted_values, u):
+    position = u * (len(sorted_values) - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def student_ids(start, n):
+    # "G" + 8 zero-padded digits, built as bytes to avoid formatting row by row
+    digits = (np.arange(start, start + n)[:, None] // 10 ** np.arange(7, -1, -1)) % 10
+    buffer = np.empty((n, 9), dtype=np.uint8)
+    buffer[:, 0] = ord('G')
+    buffer[:, 1:] = digits + ord('0')
+    return buffer.view('S9').ravel().astype('U9')
+
+
+def sample(model, latent, start):
+    """Rows for the latent normals `latent`, numbered from `start`."""
+    u = ndtr(latent @ model['cholesky'].T)
+    index = {column: i for i, column in enumerate(model['columns'])}
+
+    data = {'Student_ID': student_ids(start, len(latent))}
+    for column in NUMERIC_FEATURES:
+        values = empirical_quantile(model['sorted_values'][column], u[:, index[column]])
+        data[column] = np.round(values).astype(np.int64) if model['integer'][column] else values
+    for column, categories in CATEGORICAL_FEATURES.items():
+        codes = np.searchsorted(model['categorical_cutoffs'][column], u[:, index[column]], side='right')
+        data[column] = pd.Categorical.from_codes(codes, categories=categories)
+    data['Pass_Fail'] = np.where(data['Final_Exam_Score'] >= model['pass_score'], 'Pass', 'Fail')
+
+    return pd.DataFrame(data, columns=COLUMNS)
+
+
+def generate(model, rows, seed=42, chunk_size=500_000):
+    """Yield DataFrames of synthetic students, `chunk_size` rows at a time.
+
+    Normal variates are drawn sequentially from one generator, so the rows
+    don't depend on chunk_size.
+    """
+    rng = np.random.default_rng(seed)
+    dimensions = len(model['columns'])
+    for start in range(0, rows, chunk_size):
+        n = min(chunk_size, rows - start)
+        yield sample(model, rng.standard_normal((n, dimensions)), start)
+
+
+# ----------------------
+# Writers
+# ----------------------
+def write_csv(chunks, path):
+    rows = 0
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        rows += len(chunk)
+    return rows
+
+
+def write_parquet(chunks, path):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet output needs pyarrow: pip install pyarrow")
+
+    rows, writer = 0, None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def write_dynamodb(chunks, table_name, endpoint_url, region="ap-southeast-1"):
+    """Load rows into a DynamoDB stand-in (DynamoDB Local, moto server, ...).
+
+    Items use the app's schema: the generated final score becomes
+    Predicted_Final_Score.
+    """
+    import boto3
+
+    dynamodb = boto3.resource("dynamodb", region_name=region, endpoint_url=endpoint_url)
+    table = dynamodb.Table(table_name)
+    rows = 0
+    with table.batch_writer() as batch:
+        for chunk in chunks:
+            chunk = chunk.drop(columns=['Pass_Fail']).rename(
+                columns={'Student_ID': 'StudentID', 'Final_Exam_Score': 'Predicted_Final_Score'})
+            for record in chunk.to_dict('records'):
+                batch.put_item(Item={
+                    k: Decimal(str(v)) if isinstance(v, (float, int)) else v for k, v in record.items()
+                })
+            rows += len(chunk)
+    return rows
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic student performance data")
+    parser.add_argument("--source", default="ml_model/data/student_performance.csv")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=500_000)
+    parser.add_argument("--output", help=".csv or .parquet file")
+    parser.add_argument("--dynamodb-endpoint", help="e.g. http://localhost:8000")
+    parser.add_argument("--table", default="StudentPerformancePredictions")
+    args = parser.parse_args(argv)
+    if not args.output and not args.dynamodb_endpoint:
+        parser.error("one of --output or --dynamodb-endpoint is required")
+    if not 1 <= args.rows <= MAX_ROWS:
+        parser.error(f"--rows must be between 1 and {MAX_ROWS} (Student_IDs have 8 digits)")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if not os.path.exists(args.source):
+        raise FileNotFoundError(f"{args.source} not found!")
+
+    model = fit(pd.read_csv(args.source))
+    print(f"✅ Fitted generator on {args.source}")
+
+    started = time.time()
+    chunks = generate(model, args.rows, seed=args.seed, chunk_size=args.chunk_size)
+    if args.dynamodb_endpoint:
+        rows = write_dynamodb(chunks, args.table, args.dynamodb_endpoint)
+        target = f"{args.table} at {args.dynamodb_endpoint}"
+    elif args.output.endswith(".parquet"):
+        rows = write_parquet(chunks, args.output)
+        target = args.output
+    else:
+        rows = write_csv(chunks, args.output)
+        target = args.output
+
+    elapsed = time.time() - started
+    print(f"💾 Wrote {rows} rows to {target} in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
@@ -1,18 +1,31 @@
 import joblib
 import json
+import threading
+from collections import OrderedDict
 import numpy as np
 import pandas as pd
 
+EXPLAIN_CACHE_SIZE = 4096
+EXPLAIN_CHUNK_ROWS = 1024
+
 def model_fn(model_dir):
-    model = joblib.load(f"{model_dir}/model.joblib")
-    return model
+    # The explainer is built on the first explain request (serve.py can
+    # build it up front with --preload-explainer)
+    return joblib.load(f"{model_dir}/model.joblib")
 
 def input_fn(request_body, request_content_type):
     if request_content_type == "application/json":
         data = json.loads(request_body)
 
+        # Either a list of records or {"instances": [...], "explain": true}
+        explain = False
+        if isinstance(data, dict) and "instances" in data:
+            explain = bool(data.get("explain", False))
+            data = data["instances"]
+
         # Convert to DataFrame — IMPORTANT
         df = pd.DataFrame(data)
+        df.attrs["explain"] = explain
 
         return df   # pipeline expects DataFrame
     else:
@@ -21,6 +34,8 @@ def input_fn(request_body, request_content_type):
 
 def predict_fn(input_data, model):
     try:
+        if input_data.attrs.get("explain"):
+            return explain_predictions(input_data, model)
         preds = model.predict(input_data)
         return preds
     except Exception as e:
@@ -28,4 +43,126 @@ def predict_fn(input_data, model):
 
 
 def output_fn(prediction, content_type):
+    # A failed prediction must fail the invocation (5xx), not come back as a result
+    if isinstance(prediction, dict) and "error" in prediction:
+        raise ValueError(prediction["error"])
+    if isinstance(prediction, dict):
+        return json.dumps(prediction)
     return json.dumps({"prediction": prediction.tolist()})
+
+
+# ----------------------
+# Explanations
+# ----------------------
+class ForestExplainer:
+    """Per-feature contributions for a preprocessor + RandomForest pipeline.
+
+    Each prediction is split into the forest's bias (mean root value) plus
+    the change in node value along the decision path, credited to the feature
+    split on. Contributions are precomputed for every node, so explaining a
+    row only needs its leaf in each tree. The table is folded back to the
+    input features tree by tree and kept as float32, so it stays small for
+    forests with millions of nodes.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.preprocessor = model.named_steps["preprocessor"]
+        self.forest = model.named_steps["regressor"]
+        # Input columns the model actually uses (dropped columns such as Pass_Fail are left out)
+        self.feature_names = [
+            column
+            for name, transformer, columns in self.preprocessor.transformers_
+            if transformer != "drop" and name != "remainder"
+            for column in columns
+        ]
+
+        feature_map = self._feature_map()
+        node_counts = [estimator.tree_.node_count for estimator in self.forest.estimators_]
+        self.offsets = np.concatenate([[0], np.cumsum(node_counts)[:-1]])
+        self.node_table = np.empty((sum(node_counts), len(self.feature_names)), dtype=np.float32)
+        for estimator, offset, count in zip(self.forest.estimators_, self.offsets, node_counts):
+            self.node_table[offset:offset + count] = self._node_contributions(estimator.tree_) @ feature_map
+        self.bias = float(np.mean([estimator.tree_.value[0, 0, 0] for estimator in self.forest.estimators_]))
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _node_contributions(self, tree):
+        # Cumulative contribution from the root to every node, one tree level at a time
+        values = tree.value[:, 0, 0]
+        contributions = np.zeros((tree.node_count, self.forest.n_features_in_))
+        parents = np.array([0])
+        while parents.size:
+            parents = parents[tree.children_left[parents] != -1]
+            for children in (tree.children_left[parents], tree.children_right[parents]):
+                contributions[children] = contributions[parents]
+                contributions[children, tree.feature[parents]] += values[children] - values[parents]
+            parents = np.concatenate([tree.children_left[parents], tree.children_right[parents]])
+        return contributions
+
+    def _feature_map(self):
+        # (transformed columns x original columns): one-hot columns fold back into their source
+        feature_map = np.zeros((self.forest.n_features_in_, len(self.feature_names)))
+        for name, transformer, columns in self.preprocessor.transformers_:
+            if transformer == "drop" or name == "remainder":
+                continue
+            if hasattr(transformer, "categories_"):
+                widths = [len(categories) for categories in transformer.categories_]
+            else:
+                widths = [1] * len(columns)
+            position = self.preprocessor.output_indices_[name].start
+            for column, width in zip(columns, widths):
+                feature_map[position:position + width, self.feature_names.index(column)] = 1
+                position += width
+        return feature_map
+
+    def contributions(self, transformed):
+        keys = [row.tobytes() for row in transformed]
+        result = np.empty((len(keys), len(self.feature_names)))
+
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is None:
+                    missing.append(i)
+                else:
+                    self._cache.move_to_end(key)
+                    result[i] = cached
+
+        for start in range(0, len(missing), EXPLAIN_CHUNK_ROWS):
+            rows = missing[start:start + EXPLAIN_CHUNK_ROWS]
+            leaves = self.forest.apply(transformed[rows]) + self.offsets
+            computed = self.node_table[leaves].mean(axis=1, dtype=np.float64)
+            result[rows] = computed
+
+            with self._lock:
+                for i, values in zip(rows, computed):
+                    self._cache[keys[i]] = values
+                while len(self._cache) > EXPLAIN_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+
+        return result
+
+
+_explainers = {}
+
+def get_explainer(model):
+    explainer = _explainers.get(id(model))
+    if explainer is None or explainer.model is not model:
+        explainer = _explainers[id(model)] = ForestExplainer(model)
+    return explainer
+
+
+def explain_predictions(input_data, model):
+    explainer = get_explainer(model)
+    transformed = np.asarray(explainer.preprocessor.transform(input_data), dtype=np.float64)
+    preds = explainer.forest.predict(transformed)
+    contributions = explainer.contributions(transformed)
+
+    explanation = [
+        {"bias": explainer.bias, "contributions": dict(zip(explainer.feature_names, row.tolist()))}
+        for row in contributions
+    ]
+    return {"prediction": preds.tolist(), "explanation": explanation}
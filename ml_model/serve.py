@@ -0,0 +1,210 @@
+import argparse
+import gc
+import json
+import os
+import signal
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Array
+
+import inference
+
+# Local stand-in for the SageMaker endpoint. Serves the same /ping and
+# /invocations contract using the functions in inference.py.
+#
+# The model is loaded once in the parent and workers are forked afterwards,
+# so the forest arrays are shared copy-on-write between them.
+#
+#   python ml_model/serve.py --model-dir ml_model/model --workers 4 --port 8080
+
+
+class InferenceServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class InvocationHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive
+
+    # Set on the class before forking
+    model = None
+    worker_index = 0
+    stats = None
+
+    def do_GET(self):
+        if self.path == "/ping":
+            self._send(200, b"")
+        elif self.path == "/stats":
+            self._send(200, json.dumps(read_stats(self.stats)).encode("utf-8"), "application/json")
+        else:
+            self._send(404, json.dumps({"error": "Not found"}).encode("utf-8"), "application/json")
+
+    def do_POST(self):
+        if self.path != "/invocations":
+            self._send(404, json.dumps({"error": "Not found"}).encode("utf-8"), "application/json")
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length).decode("utf-8")
+        content_type = self.headers.get("Content-Type", "application/json").split(";")[0].strip()
+
+        try:
+            input_data = inference.input_fn(body, content_type)
+        except Exception as e:
+            self._send(415 if content_type != "application/json" else 400,
+                       json.dumps({"error": str(e)}).encode("utf-8"), "application/json")
+            return
+
+        prediction = inference.predict_fn(input_data, self.model)
+        if isinstance(prediction, dict) and "error" in prediction:
+            self._send(500, json.dumps(prediction).encode("utf-8"), "application/json")
+            return
+
+        self._send(200, inference.output_fn(prediction, "application/json").encode("utf-8"), "application/json")
+        record_request(self.stats, self.worker_index, len(input_data))
+
+    def _send(self, status, body, content_type=None):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# ----------------------
+# Per-worker counters (shared memory, allocated before fork)
+# ----------------------
+def create_stats(workers):
+    # [requests, rows] per worker. Each worker only writes its own slots, so
+    # there is no lock a killed worker could leave held
+    return Array("q", workers * 2, lock=False)
+
+
+def record_request(stats, worker_index, rows):
+    stats[worker_index * 2] += 1
+    stats[worker_index * 2 + 1] += rows
+
+
+def read_stats(stats):
+    values = list(stats)
+    return [
+        {"worker": i, "requests": values[i * 2], "rows": values[i * 2 + 1]}
+        for i in range(len(values) // 2)
+    ]
+
+
+def report_throughput(previous, current, elapsed):
+    for before, after in zip(previous, current):
+        rps = (after["requests"] - before["requests"]) / elapsed
+        rows = (after["rows"] - before["rows"]) / elapsed
+        print(f"📊 worker {after['worker']}: {rps:.1f} req/s, {rows:.1f} rows/s "
+              f"({after['requests']} requests total)")
+
+
+# ----------------------
+# Workers
+# ----------------------
+def run_worker(server, worker_index):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *_: os._exit(0))
+    InvocationHandler.worker_index = worker_index
+    try:
+        server.serve_forever()
+    finally:
+        os._exit(0)
+
+
+def spawn_worker(server, worker_index):
+    pid = os.fork()
+    if pid == 0:
+        run_worker(server, worker_index)
+    return pid
+
+
+def serve(model_dir, host, port, workers, report_interval, preload_explainer=False):
+    print(f"🚀 Loading model from {model_dir}")
+    InvocationHandler.model = inference.model_fn(model_dir)
+    InvocationHandler.stats = create_stats(workers)
+    print("✅ Model loaded")
+
+    # Built here, the explainer's node table is shared by the workers instead
+    # of being built by each of them on its first explain request
+    if preload_explainer:
+        inference.get_explainer(InvocationHandler.model)
+        print("✅ Explainer built")
+
+    server = InferenceServer((host, port), InvocationHandler)
+
+    # Keep the loaded model out of the collector's reach so the workers
+    # don't touch (and copy) its pages just by running gc.
+    gc.collect()
+    gc.freeze()
+
+    pids = {spawn_worker(server, i): i for i in range(workers)}
+    print(f"🎉 Serving on http://{host}:{port} with {workers} workers")
+
+    stopping = False
+
+    def stop(*_):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    previous = read_stats(InvocationHandler.stats)
+    last_report = time.monotonic()
+    while not stopping:
+        time.sleep(0.5)
+
+        # Replace workers that died unexpectedly
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            index = pids.pop(pid, None)
+            if index is not None and not stopping:
+                print(f"⚠️ Worker {index} exited, restarting...")
+                pids[spawn_worker(server, index)] = index
+
+        now = time.monotonic()
+        if report_interval and now - last_report >= report_interval:
+            current = read_stats(InvocationHandler.stats)
+            report_throughput(previous, current, now - last_report)
+            previous, last_report = current, now
+
+    print("🛑 Shutting down workers...")
+    for pid in pids:
+        os.kill(pid, signal.SIGTERM)
+    for pid in pids:
+        os.waitpid(pid, 0)
+    server.server_close()
+    print(json.dumps(read_stats(InvocationHandler.stats)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local SageMaker-compatible inference server")
+    parser.add_argument("--model-dir", default=os.environ.get("SM_MODEL_DIR", "ml_model/model"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--report-interval", type=float, default=10.0,
+                        help="Seconds between throughput reports (0 disables)")
+    parser.add_argument("--preload-explainer", action="store_true",
+                        help="Build the explainer before forking the workers")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if not os.path.exists(os.path.join(args.model_dir, "model.joblib")):
+        raise FileNotFoundError(f"{args.model_dir}/model.joblib not found! Train the model first.")
+    serve(args.model_dir, args.host, args.port, max(1, args.workers), args.report_interval,
+          args.preload_explainer)
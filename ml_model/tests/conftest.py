@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+
+@pytest.fixture
+def model():
+    rng = np.random.default_rng(0)
+    n = 300
+    X = pd.DataFrame({
+        "Hours": rng.uniform(0, 40, n),
+        "Level": rng.choice(["Low", "Mid", "High"], n),
+        "Label": rng.choice(["Pass", "Fail"], n),     # dropped by the preprocessor, like Pass_Fail
+    })
+    y = X["Hours"] + X["Level"].map({"Low": 0, "Mid": 5, "High": 10}) + rng.normal(0, 1, n)
+
+    preprocessor = ColumnTransformer(transformers=[
+        ("num", StandardScaler(), ["Hours"]),
+        ("cat", OneHotEncoder(handle_unknown="ignore", sparse_output=False), ["Level"]),
+    ])
+    return Pipeline(steps=[
+        ("preprocessor", preprocessor),
+        ("regressor", RandomForestRegressor(n_estimators=20, max_depth=6, random_state=0)),
+    ]).fit(X, y)
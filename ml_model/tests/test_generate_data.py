@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+
+import generate_data
+
+SOURCE = "ml_model/data/student_performance.csv"
+
+
+@pytest.fixture(scope="module")
+def source():
+    return pd.read_csv(SOURCE)
+
+
+def test_spearman_matches_source(source):
+    model = generate_data.fit(source)
+    synthetic = pd.concat(generate_data.generate(model, 200_000, seed=1))
+
+    expected = source[generate_data.NUMERIC_FEATURES].corr("spearman")
+    actual = synthetic[generate_data.NUMERIC_FEATURES].corr("spearman")
+    assert (actual - expected).abs().to_numpy().max() < 0.02
+
+
+def test_chunk_size_does_not_change_rows(source):
+    model = generate_data.fit(source)
+    whole = pd.concat(generate_data.generate(model, 1000, seed=3, chunk_size=1000), ignore_index=True)
+    chunked = pd.concat(generate_data.generate(model, 1000, seed=3, chunk_size=128), ignore_index=True)
+    pd.testing.assert_frame_equal(whole, chunked)
+    assert whole["Student_ID"].is_unique
+
+
+@pytest.mark.parametrize("rows", [0, generate_data.MAX_ROWS + 1])
+def test_rows_out_of_range(rows):
+    with pytest.raises(SystemExit):
+        generate_data.parse_args(["--rows", str(rows), "--output", "out.csv"])
@@ -0,0 +1,92 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+import inference
+
+
+def explain(model, records):
+    body = json.dumps({"instances": records, "explain": True})
+    return inference.predict_fn(inference.input_fn(body, "application/json"), model)
+
+
+RECORDS = [{"Hours": 5.0, "Level": "Low"}, {"Hours": 30.0, "Level": "High"}, {"Hours": 18.0, "Level": "Mid"}]
+
+
+# ---------------------------
+# TEST: bias + contributions reproduce the prediction
+# ---------------------------
+def test_contributions_sum_to_prediction(model):
+    result = explain(model, RECORDS)
+
+    expected = model.predict(pd.DataFrame(RECORDS))
+    assert np.allclose(result["prediction"], expected)
+    for prediction, explanation in zip(result["prediction"], result["explanation"]):
+        total = explanation["bias"] + sum(explanation["contributions"].values())
+        assert total == pytest.approx(prediction, abs=1e-4)   # float32 node table
+
+
+# ---------------------------
+# TEST: one-hot columns fold back into their input feature
+# ---------------------------
+def test_one_hot_columns_fold_back(model):
+    explainer = inference.get_explainer(model)
+    assert explainer.feature_names == ["Hours", "Level"]
+
+    transformed = model.named_steps["preprocessor"].transform(pd.DataFrame(RECORDS))
+    folded = explainer.contributions(transformed)
+
+    # Unfolded per-column contributions, averaged over trees
+    forest = model.named_steps["regressor"]
+    leaves = forest.apply(transformed)
+    unfolded = np.mean([
+        explainer._node_contributions(estimator.tree_)[leaves[:, i]]
+        for i, estimator in enumerate(forest.estimators_)
+    ], axis=0)
+
+    assert np.allclose(folded[:, 0], unfolded[:, 0], atol=1e-4)
+    assert np.allclose(folded[:, 1], unfolded[:, 1:4].sum(axis=1), atol=1e-4)
+    assert set(explain(model, RECORDS)["explanation"][0]["contributions"]) == {"Hours", "Level"}
+
+
+# ---------------------------
+# TEST: cached rows skip the forest
+# ---------------------------
+def test_contribution_cache(model):
+    explainer = inference.get_explainer(model)
+    transformed = model.named_steps["preprocessor"].transform(pd.DataFrame(RECORDS))
+    first = explainer.contributions(transformed)
+
+    with patch.object(explainer.forest, "apply", side_effect=AssertionError("cache miss")):
+        second = explainer.contributions(transformed)
+
+    assert np.array_equal(first, second)
+
+
+# ---------------------------
+# TEST: the explainer is only built on the first explain request
+# ---------------------------
+def test_model_fn_defers_explainer(model, tmp_path):
+    import joblib
+    joblib.dump(model, tmp_path / "model.joblib")
+
+    loaded = inference.model_fn(str(tmp_path))
+    assert id(loaded) not in inference._explainers
+
+    explain(loaded, RECORDS)
+    assert inference._explainers[id(loaded)].node_table.dtype == np.float32
+
+
+# ---------------------------
+# TEST: a failed prediction fails the invocation
+# ---------------------------
+def test_output_fn_raises_on_error(model):
+    body = json.dumps([{"Hours": 5.0}])     # no Level column
+    prediction = inference.predict_fn(inference.input_fn(body, "application/json"), model)
+
+    assert "error" in prediction
+    with pytest.raises(ValueError):
+        inference.output_fn(prediction, "application/json")
@@ -0,0 +1,143 @@
+import glob
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import joblib
+import pandas as pd
+import pytest
+
+pytestmark = pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="needs fork and /proc")
+
+ML_MODEL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RECORDS = [{"Hours": 5.0, "Level": "Low"}, {"Hours": 30.0, "Level": "High"}]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def children(pid):
+    found = []
+    for path in glob.glob("/proc/[0-9]*/stat"):
+        try:
+            with open(path) as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            found.append(int(path.split("/")[2]))
+    return found
+
+
+def wait_for(condition, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if condition():
+                return
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise AssertionError("timed out")
+
+
+def ping(port):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        connection.request("GET", "/ping")
+        return connection.getresponse().status == 200
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def server(model, tmp_path):
+    joblib.dump(model, tmp_path / "model.joblib")
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-c",
+         f"import serve; serve.serve({str(tmp_path)!r}, '127.0.0.1', {port}, 2, 0)"],
+        cwd=ML_MODEL_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for(lambda: ping(port) and len(children(process.pid)) == 2)
+        yield process, port
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def post(connection, body, content_type="application/json"):
+    connection.request("POST", "/invocations", body=body, headers={"Content-Type": content_type})
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def get_stats(connection):
+    connection.request("GET", "/stats")
+    return json.loads(connection.getresponse().read())
+
+
+# ---------------------------
+# TEST: keep-alive invocations, error statuses and per-worker counters
+# ---------------------------
+def test_invocations_and_stats(server, model):
+    _, port = server
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+
+    status, first = post(connection, json.dumps(RECORDS))
+    sock = connection.sock
+    status2, second = post(connection, json.dumps(RECORDS[:1]))
+    assert (status, status2) == (200, 200)
+    assert connection.sock is sock          # same connection, not reopened
+    assert first["prediction"] == pytest.approx(model.predict(pd.DataFrame(RECORDS)).tolist())
+    assert second["prediction"] == pytest.approx(first["prediction"][:1])
+
+    status, body = post(connection, "{not json")
+    assert status == 400 and "error" in body
+    status, body = post(connection, json.dumps([{"Hours": 5.0}]))     # no Level column
+    assert status == 500 and "error" in body
+
+    stats = get_stats(connection)
+    connection.close()
+
+    # Only successful invocations count; all of them went to one worker
+    assert [s["worker"] for s in stats] == [0, 1]
+    assert sum(s["requests"] for s in stats) == 2
+    assert sum(s["rows"] for s in stats) == 3
+    assert sorted(s["requests"] for s in stats) == [0, 2]
+
+
+# ---------------------------
+# TEST: a dead worker is replaced and the counters survive it
+# ---------------------------
+def test_worker_restart(server):
+    process, port = server
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    assert post(connection, json.dumps(RECORDS))[0] == 200
+    # Counted after the response is sent
+    wait_for(lambda: sum(s["requests"] for s in get_stats(connection)) == 1)
+    connection.close()
+
+    workers = children(process.pid)
+    os.kill(workers[0], signal.SIGKILL)
+    wait_for(lambda: workers[0] not in children(process.pid) and len(children(process.pid)) == 2)
+    wait_for(lambda: ping(port))
+
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    stats = get_stats(connection)
+    connection.close()
+    assert sum(s["requests"] for s in stats) == 1
+    assert sum(s["rows"] for s in stats) == 2
@@ -7,28 +7,43 @@ from sklearn.ensemble import RandomForestRegressor
 from sklearn.pipeline import Pipeline
 import os
 import subprocess
+import sys
+import json
+
+# Drift sketches are shared with the Lambda that tracks live requests
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend", "lambda"))
+import drift
   
 
 def train_and_save_model():
     print("🚀 Starting model training")
 
-    # --- 1. Load CSV from local repo ---
-    local_csv_path = "ml_model/data/student_performance.csv"
+    numerical_features = ['Study_Hours_per_Week', 'Attendance_Rate', 'Midterm_Exam_Scores']
+    categorical_features = [
+        'Gender', 'Parental_Education_Level',
+        'Internet_Access_at_Home', 'Extracurricular_Activities'
+    ]
+
+    # --- 1. Load CSV from local repo (TRAIN_CSV overrides, e.g. generate_data.py output) ---
+    local_csv_path = os.environ.get("TRAIN_CSV", "ml_model/data/student_performance.csv")
     if not os.path.exists(local_csv_path):
         raise FileNotFoundError(f"{local_csv_path} not found!")
-    
-    df = pd.read_csv(local_csv_path)
-    print("✅ Data loaded from local CSV")
+
+    # Categoricals as category dtype and no Student_ID keep large files in memory
+    if local_csv_path.endswith(".parquet"):
+        df = pd.read_parquet(local_csv_path)
+    else:
+        df = pd.read_csv(local_csv_path, usecols=lambda c: c != 'Student_ID',
+                         dtype={c: "category" for c in categorical_features + ['Pass_Fail']})
+    print(f"✅ Data loaded from {local_csv_path} ({len(df)} rows)")
 
     # --- 2. Prepare data ---
-    X = df.drop(['Student_ID', 'Final_Exam_Score'], axis=1)
+    X = df.drop(['Student_ID', 'Final_Exam_Score'], axis=1, errors='ignore')
     y = df['Final_Exam_Score']
 
-    numerical_features = ['Study_Hours_per_Week', 'Attendance_Rate', 'Midterm_Exam_Scores']
-    categorical_features = [
-        'Gender', 'Parental_Education_Level',
-        'Internet_Access_at_Home', 'Extracurricular_Activities'
-    ]
+    # Bootstrap size per tree; set for multi-million-row datasets to bound tree size
+    max_samples = os.environ.get("TRAIN_MAX_SAMPLES")
+    max_samples = int(max_samples) if max_samples else None
 
     preprocessor = ColumnTransformer(
         transformers=[
@@ -39,12 +54,14 @@ def train_and_save_model():
 
     model_pipeline = Pipeline(steps=[
         ('preprocessor', preprocessor),
-        ('regressor', RandomForestRegressor(n_estimators=100, random_state=42))
+        ('regressor', RandomForestRegressor(n_estimators=100, random_state=42,
+                                            max_samples=max_samples, n_jobs=-1))
     ])
 
     # --- 3. Train the model ---
     print("📚 Training model...")
     model_pipeline.fit(X, y)
+    model_pipeline.set_params(regressor__n_jobs=None)   # single-row predictions are faster without the pool
     print("✅ Model training complete")
 
     # --- 4. Save model locally ---
@@ -53,6 +70,15 @@ def train_and_save_model():
     joblib.dump(model_pipeline, local_model_path)
     print(f"💾 Model saved locally at {local_model_path}")
 
+    # --- 5. Save drift reference sketch ---
+    # (from at most 100k rows; quantiles and frequencies don't need more)
+    reference_rows = X.sample(n=min(len(X), 100_000), random_state=42)
+    reference = drift.build_reference({feature: reference_rows[feature].tolist() for feature in numerical_features + categorical_features})
+    local_reference_path = "ml_model/model/drift_reference.json"
+    with open(local_reference_path, "w") as f:
+        json.dump(reference, f)
+    print(f"📏 Drift reference saved at {local_reference_path}")
+
 
   
 
@@ -75,6 +101,18 @@ def train_and_save_model():
 
    
 
+    # Only the default training data may replace the production artifacts;
+    # a TRAIN_CSV run (e.g. synthetic data) stays local unless TRAIN_UPLOAD=1
+    if "TRAIN_UPLOAD" in os.environ:
+        upload = os.environ["TRAIN_UPLOAD"] == "1"
+        reason = "TRAIN_UPLOAD is not 1"
+    else:
+        upload = "TRAIN_CSV" not in os.environ
+        reason = "TRAIN_CSV is set; use TRAIN_UPLOAD=1 to force"
+    if not upload:
+        print(f"⏭️ Skipping S3 upload ({reason})")
+        return
+
     bucket_name = "g30-student-performance-analysis"        
     s3_key = "model-artifacts/model.tar.gz"       # Path inside bucket
 
@@ -84,6 +122,10 @@ def train_and_save_model():
     s3.upload_file(tar_path, bucket_name, s3_key)
     print(f"🎉 Model uploaded successfully to s3://{bucket_name}/{s3_key}")
 
+    reference_key = "model-artifacts/drift_reference.json"
+    s3.upload_file(local_reference_path, bucket_name, reference_key)
+    print(f"📏 Drift reference uploaded to s3://{bucket_name}/{reference_key}")
+
     
 
 if __name__ == "__main__":